@@ -1,5 +1,12 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from seqtools.composition import symbol_counts
+
 seq = input("Enter a sequence: ")
 
-for symbol in set(seq):
-    freq = seq.count(symbol) / len(seq)
+# All symbol counts in one pass instead of one seq.count() per symbol
+for symbol, count in symbol_counts(seq).items():
+    freq = count / len(seq)
     print(symbol, ":", round(freq, 3))
@@ -1,87 +1,122 @@
 import tkinter as tk
 from tkinter import filedialog, messagebox, ttk
 import os
-from collections import Counter
+import sys
+import argparse
+import csv
+import glob
+import json
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+import queue
 import string
-import time # Added for simulating a longer task
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from seqtools.composition import symbol_counts
+from seqtools.fasta import iter_fasta, open_fasta, parse_fasta_lines
+from seqtools.normalize import LETTERS, normalize_sequence
 
 # --- Core Biological Sequence Algorithms (Integrating lab1_1 & lab1_2 logic) ---
 
-def read_fasta(filepath: str) -> tuple[str, str]:
+PROGRESS_LINES = 4096      # Report reading progress every N lines
+ANALYSIS_CHUNK = 1 << 20   # Count letters in chunks of this many characters
+
+
+class AnalysisCancelled(Exception):
+    """Raised inside the worker when the user presses Cancel."""
+
+
+def _check_cancel(cancel_event: threading.Event = None):
+    if cancel_event is not None and cancel_event.is_set():
+        raise AnalysisCancelled()
+
+
+def read_fasta(filepath: str, progress=None, cancel_event: threading.Event = None) -> tuple[str, str]:
     """
     Reads a FASTA file, extracts the header, and concatenates the sequence lines 
-    into a single string (the 'buffer').
+    into a single string (the 'buffer'). Gzip/BGZF-compressed files are
+    decompressed on the fly.
     
     Args:
         filepath: The path to the FASTA file.
+        progress: Optional callback receiving the fraction (0..1) of the file's
+            bytes consumed so far.
+        cancel_event: Optional event; reading stops with AnalysisCancelled once it is set.
 
     Returns:
-        A tuple (header_line, sequence_buffer). Both are empty strings on error or if no sequence is found.
+        A tuple (header_line, sequence_buffer). The sequence buffer is an empty string if no sequence is found.
+
+    Raises:
+        OSError: If the file cannot be read. Errors are not shown here, so
+            the function can run outside the Tk thread.
     """
-    header = ""
-    sequence_lines = []
-    
-    try:
-        with open(filepath, 'r') as f:
-            for line in f:
-                line = line.strip()
-                if not line:
-                    continue
-                
-                if line.startswith('>'):
-                    if not header:
-                        header = line[1:]
-                    elif sequence_lines:
-                        break
-                elif header:
-                    sequence_lines.append(line)
-        
-        sequence_buffer = "".join(sequence_lines)
-        return header, sequence_buffer
-        
-    except Exception as e:
-        messagebox.showerror("File Error", f"An error occurred while reading the file: {e}")
-        return "", ""
+    header = None
+    size = os.path.getsize(filepath) or 1
 
+    with open(filepath, 'rb') as raw, open_fasta(raw) as handle:
+        def lines():
+            for i, line in enumerate(handle):
+                if i % PROGRESS_LINES == 0:
+                    _check_cancel(cancel_event)
+                    if progress:
+                        progress(raw.tell() / size)
+                yield line
 
-def analyze_sequence(sequence: str, progress_bar: ttk.Progressbar) -> str:
+        for record_header, sequence_buffer in parse_fasta_lines(lines()):
+            if header is None:
+                header = record_header
+            if sequence_buffer:
+                return header, sequence_buffer
+
+    return header or "", ""
+
+
+def letter_counts(sequence: str) -> dict[str, int]:
+    """
+    Counts the letters of a raw sequence, case-insensitively, ignoring
+    every character that is not a letter. Pure function shared by the GUI
+    and the batch mode; chunk counts can simply be added together.
+
+    Args:
+        sequence: A raw sequence string (or a chunk of one).
+
+    Returns:
+        A dict mapping each uppercase letter present to its count, sorted by letter.
+    """
+    return symbol_counts(normalize_sequence(sequence, alphabet=LETTERS).sequence)
+
+
+def analyze_sequence(sequence: str, progress=None, cancel_event: threading.Event = None) -> str:
     """
     Applies the letter analysis algorithms to the sequence buffer,
-    updating the progress bar during the process.
+    reporting progress as the letters are counted.
     
     Args:
         sequence: The concatenated biological sequence string (the buffer).
-        progress_bar: The ttk.Progressbar widget to update.
+        progress: Optional callback receiving the fraction (0..1) of the sequence counted so far.
+        cancel_event: Optional event; counting stops with AnalysisCancelled once it is set.
         
     Returns:
         A formatted string with the analysis results.
     """
-    progress_bar.configure(value=0, mode='determinate')
-    progress_bar.start()
-
     if not sequence:
-        progress_bar.stop()
         return "No biological sequence found to analyze."
 
-    # Pre-process the sequence
-    cleaned_sequence = "".join(c.upper() for c in sequence if c.isalpha())
-    total_letters = len(cleaned_sequence)
-    
+    # Calculate letter frequency chunk by chunk, so progress and Cancel stay responsive
+    counts = Counter()
+    for start in range(0, len(sequence), ANALYSIS_CHUNK):
+        _check_cancel(cancel_event)
+        counts.update(letter_counts(sequence[start:start + ANALYSIS_CHUNK]))
+        if progress:
+            progress(min(start + ANALYSIS_CHUNK, len(sequence)) / len(sequence))
+
+    total_letters = sum(counts.values())
     if total_letters == 0:
-        progress_bar.stop()
         return "Sequence found, but it contained no valid alphabetical characters for analysis."
-    
-    # Step 1: Find unique alphabet
-    unique_alphabet = sorted(list(set(cleaned_sequence)))
-    alphabet_str = "".join(unique_alphabet)
-    
-    # Simulate partial progress for a longer process
-    time.sleep(1) 
-    progress_bar.configure(value=50)
-    progress_bar.update()
 
-    # Step 2: Calculate letter frequency
-    counts = Counter(cleaned_sequence)
+    # The alphabet is the set of letters that were counted
+    alphabet_str = "".join(sorted(counts))
 
     results = [
         "--- FASTA Sequence Analysis ---",
@@ -95,24 +130,154 @@ def analyze_sequence(sequence: str, progress_bar: ttk.Progressbar) -> str:
         count = counts[letter]
         percentage = (count * 100.0) / total_letters
         results.append(f"  {letter} : {percentage:.2f}%")
-    
-    # Finalize progress
-    time.sleep(1)
-    progress_bar.configure(value=100)
-    progress_bar.update()
-    progress_bar.stop()
 
     return "\n".join(results)
 
 
+# --- Headless Batch Mode ---
+
+CSV_FIELDS = ["file", "header", "length", "letters", "alphabet"] + list(string.ascii_uppercase)
+
+
+def analyze_record(file_path: str, header: str, sequence: str) -> dict:
+    """
+    Analyzes one FASTA record for the batch mode (runs in a worker process).
+
+    Returns:
+        A result row: file, header, raw length, letter count, alphabet and
+        the percentage of each letter (rounded to 4 decimals).
+    """
+    counts = letter_counts(sequence)
+    total_letters = sum(counts.values())
+    return {
+        "file": file_path,
+        "header": header,
+        "length": len(sequence),
+        "letters": total_letters,
+        "alphabet": "".join(counts),
+        "frequencies": {letter: round(count * 100.0 / total_letters, 4) for letter, count in counts.items()},
+    }
+
+
+def expand_inputs(patterns: list[str]) -> list[str]:
+    """Expands file names and glob patterns (** is recursive), keeping their order and dropping duplicates."""
+    paths = []
+    for pattern in patterns:
+        matches = sorted(glob.glob(pattern, recursive=True)) if glob.has_magic(pattern) else [pattern]
+        if not matches:
+            print(f"Warning: no files match '{pattern}'", file=sys.stderr)
+        paths.extend(matches)
+    return list(dict.fromkeys(paths))
+
+
+class ResultWriter:
+    """
+    Writes result rows as they arrive, in JSON Lines, JSON (one array) or
+    CSV (one column per letter A-Z) format.
+    """
+
+    def __init__(self, out, fmt: str):
+        self.out = out
+        self.fmt = fmt
+        self.rows = 0
+        if fmt == "csv":
+            self.csv_writer = csv.DictWriter(out, fieldnames=CSV_FIELDS)
+            self.csv_writer.writeheader()
+        elif fmt == "json":
+            out.write("[")
+
+    def write(self, row: dict):
+        if self.fmt == "csv":
+            flat = {key: row[key] for key in CSV_FIELDS[:5]}
+            flat.update(row["frequencies"])
+            self.csv_writer.writerow(flat)
+        elif self.fmt == "json":
+            self.out.write(("," if self.rows else "") + "\n" + json.dumps(row))
+        else:
+            self.out.write(json.dumps(row) + "\n")
+        self.rows += 1
+        self.out.flush()
+
+    def close(self):
+        if self.fmt == "json":
+            self.out.write("\n]\n")
+        self.out.flush()
+
+
+def run_batch(argv: list[str] = None) -> int:
+    """
+    Command-line entry point: analyzes every record of every input file and
+    streams the results to a file or stdout.
+
+    Records are read one at a time and handed to a process pool; at most
+    2 x workers records are in flight, so memory stays bounded however many
+    files are given, and rows are written in input order as they complete.
+
+    Returns:
+        The exit code: 0, or 1 if any input file could not be read.
+    """
+    parser = argparse.ArgumentParser(description="Letter composition of every record in FASTA files.")
+    parser.add_argument("inputs", nargs="+", help="FASTA files or glob patterns (plain, gzip or BGZF)")
+    parser.add_argument("--out", default="-", help="output file (default: stdout)")
+    parser.add_argument("--format", choices=["jsonl", "json", "csv"],
+                        help="output format (default: from the --out extension, else jsonl)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="worker processes")
+    args = parser.parse_args(argv)
+
+    fmt = args.format
+    if fmt is None:
+        extension = os.path.splitext(args.out)[1].lstrip(".").lower()
+        fmt = extension if extension in ("jsonl", "json", "csv") else "jsonl"
+
+    out = sys.stdout if args.out == "-" else open(args.out, "w", newline="")
+    writer = ResultWriter(out, fmt)
+    failed = False
+    max_in_flight = 2 * max(1, args.workers)
+
+    try:
+        with ProcessPoolExecutor(max_workers=max(1, args.workers)) as pool:
+            pending = deque()
+            for file_path in expand_inputs(args.inputs):
+                records = iter_fasta(file_path)
+                while True:
+                    # Only reading the input is guarded; write errors propagate.
+                    try:
+                        header, sequence = next(records)
+                    except StopIteration:
+                        break
+                    except (OSError, UnicodeDecodeError) as e:
+                        print(f"Error: could not read '{file_path}': {e}", file=sys.stderr)
+                        failed = True
+                        break
+                    pending.append(pool.submit(analyze_record, file_path, header, sequence))
+                    if len(pending) >= max_in_flight:
+                        writer.write(pending.popleft().result())
+            while pending:
+                writer.write(pending.popleft().result())
+    finally:
+        writer.close()
+        if out is not sys.stdout:
+            out.close()
+
+    return 1 if failed else 0
+
+
 # --- GUI Application (Using tkinter) ---
 
 class FastaAnalyzerGUI:
+    POLL_MS = 50  # How often the Tk loop drains the worker's message queue
+
     def __init__(self, master):
         self.master = master
         master.title("FASTA File Analyzer")
         master.geometry("600x500")
 
+        # The worker thread never touches Tk widgets; it only posts
+        # (kind, payload) messages that _poll_queue applies on the Tk thread.
+        self.messages = queue.Queue()
+        self.cancel_event = threading.Event()
+        self.worker = None
+
         # 1. Select File Button
         self.select_button = tk.Button(master, text="Choose FASTA File (*.fna / *.fasta)", 
                                        command=self.select_file, 
@@ -120,11 +285,15 @@ class FastaAnalyzerGUI:
                                        font=("Arial", 12), padx=10, pady=5)
         self.select_button.pack(pady=20, padx=10, fill='x')
 
-        # 2. Progress Bar
-        self.progress_bar = ttk.Progressbar(master, orient='horizontal', mode='determinate', length=500)
+        # 2. Progress Bar and Cancel Button
+        self.progress_bar = ttk.Progressbar(master, orient='horizontal', mode='determinate', length=500, maximum=100)
         self.progress_bar.pack(pady=(0, 10))
         self.progress_bar.pack_forget() # Initially hide the progress bar
 
+        self.cancel_button = tk.Button(master, text="Cancel", command=self.cancel_analysis, state='disabled')
+        self.cancel_button.pack(pady=(0, 10))
+        self.cancel_button.pack_forget()
+
         # 3. Output Text Area
         self.output_label = tk.Label(master, text="Analysis Results:", font=("Arial", 10, "bold"))
         self.output_label.pack(pady=(0, 5), padx=10, anchor='w')
@@ -136,11 +305,11 @@ class FastaAnalyzerGUI:
         self.results_text.insert(tk.END, "Press the button above to select a FASTA file and run the analysis.")
 
     def select_file(self):
-        """Opens a file dialog, reads the file, runs the analysis, and displays the results."""
+        """Opens a file dialog and starts the analysis of the chosen file in a worker thread."""
         
         file_path = filedialog.askopenfilename(
             defaultextension=".fasta",
-            filetypes=[("FASTA files", "*.fna *.fasta"), ("All files", "*.*")],
+            filetypes=[("FASTA files", "*.fna *.fasta *.fna.gz *.fasta.gz *.fa.gz"), ("All files", "*.*")],
             title="Select FASTA Sequence File"
         )
 
@@ -148,29 +317,85 @@ class FastaAnalyzerGUI:
             self.results_text.delete('1.0', tk.END)
             self.results_text.insert(tk.END, f"Selected file: {os.path.basename(file_path)}\n\n")
             
-            # Show the progress bar
-            self.progress_bar.pack(pady=(0, 10))
-            self.master.update_idletasks() # Update GUI to show the progress bar
+            # Show the progress bar and Cancel button; block a second run until this one ends
+            self.progress_bar.configure(value=0)
+            self.progress_bar.pack(pady=(0, 10), before=self.output_label)
+            self.cancel_button.pack(pady=(0, 10), before=self.output_label)
+            self.cancel_button.configure(state='normal')
+            self.select_button.configure(state='disabled')
 
-            header, sequence_buffer = read_fasta(file_path)
+            self.cancel_event.clear()
+            self.worker = threading.Thread(target=self._run_analysis, args=(file_path,), daemon=True)
+            self.worker.start()
+            self.master.after(self.POLL_MS, self._poll_queue)
 
+    def cancel_analysis(self):
+        """Asks the worker to stop at its next checkpoint."""
+        self.cancel_event.set()
+        self.cancel_button.configure(state='disabled')
+
+    def _run_analysis(self, file_path):
+        """Worker thread: reads (first half of the bar) and analyzes (second half) the file."""
+        post = self.messages.put
+        try:
+            header, sequence_buffer = read_fasta(
+                file_path, progress=lambda f: post(('progress', 50 * f)), cancel_event=self.cancel_event)
+            post(('header', (header, len(sequence_buffer))))
             if sequence_buffer:
-                self.results_text.insert(tk.END, f"Header/Info Line: {header}\n")
-                self.results_text.insert(tk.END, f"Raw Sequence Length (in buffer): {len(sequence_buffer)}\n\n")
-                
-                # Run the integrated analysis, passing the progress bar
-                analysis_output = analyze_sequence(sequence_buffer, self.progress_bar)
-                
-                self.results_text.insert(tk.END, analysis_output)
+                analysis_output = analyze_sequence(
+                    sequence_buffer, progress=lambda f: post(('progress', 50 + 50 * f)), cancel_event=self.cancel_event)
+                post(('done', analysis_output))
             else:
-                self.results_text.insert(tk.END, "Analysis failed. Could not find a valid sequence in the file.")
-                if header:
-                     self.results_text.insert(tk.END, f"\n(Header found: {header})")
-            
+                post(('failed', header))
+        except AnalysisCancelled:
+            post(('cancelled', None))
+        except Exception as e:
+            post(('error', str(e)))
+
+    def _poll_queue(self):
+        """Tk thread: applies the worker's messages to the widgets, then re-schedules itself."""
+        finished = False
+        try:
+            while True:
+                kind, payload = self.messages.get_nowait()
+                if kind == 'progress':
+                    self.progress_bar.configure(value=payload)
+                elif kind == 'header':
+                    header, length = payload
+                    if length:
+                        self.results_text.insert(tk.END, f"Header/Info Line: {header}\n")
+                        self.results_text.insert(tk.END, f"Raw Sequence Length (in buffer): {length}\n\n")
+                elif kind == 'done':
+                    self.results_text.insert(tk.END, payload)
+                    finished = True
+                elif kind == 'failed':
+                    self.results_text.insert(tk.END, "Analysis failed. Could not find a valid sequence in the file.")
+                    if payload:
+                        self.results_text.insert(tk.END, f"\n(Header found: {payload})")
+                    finished = True
+                elif kind == 'cancelled':
+                    self.results_text.insert(tk.END, "Analysis cancelled.")
+                    finished = True
+                elif kind == 'error':
+                    messagebox.showerror("File Error", f"An error occurred while reading the file: {payload}")
+                    finished = True
+        except queue.Empty:
+            pass
+
+        if finished:
             # Hide the progress bar after analysis is complete
             self.progress_bar.pack_forget()
+            self.cancel_button.pack_forget()
+            self.select_button.configure(state='normal')
+            self.worker = None
+        else:
+            self.master.after(self.POLL_MS, self._poll_queue)
 
 if __name__ == "__main__":
+    # With file arguments run headless (python EX3.py genomes/*.fna --out results.csv),
+    # otherwise open the GUI.
+    if len(sys.argv) > 1:
+        sys.exit(run_batch())
     root = tk.Tk()
     app = FastaAnalyzerGUI(root)
     root.mainloop()
\ No newline at end of file
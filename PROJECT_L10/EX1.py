@@ -1,7 +1,12 @@
 
+import os
+import sys
 import numpy as np
 import matplotlib.pyplot as plt
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from seqtools.downsample import DEFAULT_WIDTH_PX, decimate
+
 S = "CGGACTGATCTATCTAAAAAAAAAAAAAAAAAAAAAAAAAAACGTAGCATCTATCGATCTATCTAGCGATCTATCTACTACG"
 WINDOW_LENGTH = 30
 
@@ -56,13 +61,13 @@ def plot_pattern(positions, cg_values, ic_values):
 
     ax1.set_xlabel('Window Center Position (bp)')
     ax1.set_ylabel('C+G %', color='blue')
-    ax1.plot(positions, cg_values, color='blue', label='C+G %')
+    ax1.plot(*decimate(positions, cg_values, DEFAULT_WIDTH_PX), color='blue', label='C+G %')
     ax1.tick_params(axis='y', labelcolor='blue')
     ax1.grid(axis='y', linestyle='--', alpha=0.7)
 
     ax2 = ax1.twinx()
     ax2.set_ylabel('Index of Coincidence (Scaled)', color='red')
-    ax2.plot(positions, ic_values, color='red', linestyle='--', label='Index of Coincidence')
+    ax2.plot(*decimate(positions, ic_values, DEFAULT_WIDTH_PX), color='red', linestyle='--', label='Index of Coincidence')
     ax2.tick_params(axis='y', labelcolor='red')
 
     fig.suptitle('DNA Promoter Pattern: C+G % and Index of Coincidence')
@@ -72,7 +77,7 @@ def plot_pattern(positions, cg_values, ic_values):
 
 def plot_center_of_weight(positions, cg_values, cow):
     plt.figure(figsize=(12, 3))
-    plt.plot(positions, cg_values, color='green', alpha=0.5, label='C+G % Pattern')
+    plt.plot(*decimate(positions, cg_values, DEFAULT_WIDTH_PX), color='green', alpha=0.5, label='C+G % Pattern')
     plt.axvline(x=cow, color='red', linestyle='-', linewidth=2, label=f'Center of Weight: {cow:.2f}')
     plt.scatter([cow], [np.max(cg_values) / 2], color='red', marker='X', s=200, zorder=5, label='CoW Point')
     plt.xlabel('Window Center Position (bp)')
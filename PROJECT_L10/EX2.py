@@ -1,7 +1,13 @@
 
+import os
+import sys
 import numpy as np
 import matplotlib.pyplot as plt
-import io
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from seqtools.cache import load_fasta_cached
+from seqtools.downsample import DEFAULT_WIDTH_PX, decimate
+from seqtools.normalize import IUPAC_NUCLEOTIDES, normalize_sequence
 
 WINDOW_LENGTH = 500
 COV_COLOR = 'darkblue'
@@ -9,30 +15,16 @@ FLU_COLOR = 'darkred'
 
 def read_fasta(filename):
     sequences = []
-    current_header = None
-    current_sequence = []
     
     try:
-        with open(filename, 'r') as f:
-            data = f.read()
+        for header, sequence in load_fasta_cached(filename):
+            current_header = header.split('|')[0]
+            if current_header and len(sequence):
+                # Drops N (and anything that is not an IUPAC code) in one translate pass
+                cleaned = normalize_sequence(sequence.to_bytes(), alphabet=IUPAC_NUCLEOTIDES.replace(b'N', b''))
+                sequences.append({'header': current_header, 'sequence': cleaned.sequence.decode('ascii')})
     except FileNotFoundError:
         print(f"Warning: File '{filename}' not found. Returning empty list of sequences.")
-        return sequences
-            
-    for line in data.splitlines():
-        line = line.strip()
-        if not line:
-            continue
-        if line.startswith('>'):
-            if current_header and current_sequence:
-                sequences.append({'header': current_header, 'sequence': "".join(current_sequence)})
-            current_header = line[1:].split('|')[0]
-            current_sequence = []
-        else:
-            current_sequence.append(line.upper().replace('N', ''))
-
-    if current_header and current_sequence:
-        sequences.append({'header': current_header, 'sequence': "".join(current_sequence)})
         
     return sequences
 
@@ -68,7 +60,8 @@ def plot_objective_digital_straints(all_data):
     for data in all_data:
         label_base = data['header'].split(' ')[0]
         color = COV_COLOR if 'SARS-CoV-2' in data['header'] or 'Severe acute' in data['header'] else FLU_COLOR
-        plt.plot(data['positions'], data['cg_values'], label=data['short_label'], color=color, alpha=0.7, linewidth=1.5)
+        positions, cg_values = decimate(data['positions'], data['cg_values'], DEFAULT_WIDTH_PX)
+        plt.plot(positions, cg_values, label=data['short_label'], color=color, alpha=0.7, linewidth=1.5)
 
     plt.title('Objective Digital Straint (C+G % in 500bp Window) for Viral Genomes')
     plt.xlabel('Genomic Position (bp)')
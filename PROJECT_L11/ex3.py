@@ -1,16 +1,16 @@
 
 import tkinter as tk
 import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from seqtools.cache import load_fasta_cached
 
 def read_fasta(file_path):
-    sequence = ""
     try:
-        with open(file_path, 'r') as f:
-            for line in f:
-                if line.startswith('>'):
-                    continue
-                sequence += line.strip().upper().replace(' ', '')
-        return sequence
+        # The cache uppercases; only whitespace is removed, gaps ('-') and stops ('*') stay
+        sequence = "".join(str(seq) for _, seq in load_fasta_cached(file_path))
+        return "".join(sequence.split())
     except FileNotFoundError:
         return None
 
@@ -1,18 +1,16 @@
 
+import os
+import sys
 import math
 import matplotlib.pyplot as plt
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from seqtools.fasta import iter_fasta
+
 def read_fasta(filename):
     seqs = {}
-    with open(filename, 'r') as f:
-        name = None
-        for line in f:
-            line = line.strip()
-            if line.startswith(">"):
-                name = line[1:]
-                seqs[name] = ""
-            else:
-                seqs[name] += line.upper()
+    for name, seq in iter_fasta(filename):
+        seqs[name] = seq.upper()
     return seqs
 
 matrix = {
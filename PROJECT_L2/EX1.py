@@ -1,5 +1,10 @@
+import os
+import sys
 from itertools import product
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from seqtools.kmers import count_kmers
+
 def generate_combinations(alphabet, length):
     """Generate all combinations of given alphabet with specified length."""
     return [''.join(p) for p in product(alphabet, repeat=length)]
@@ -31,15 +36,17 @@ def main():
 
     total_pairs = max(0, len(input_str) - 1)
     print("\n--- 2-character combinations ---")
-    for combo in combos2:
-        count = count_occurrences(input_str, combo)
+    # One pass over the text for all combinations (same counts as count_occurrences)
+    counts2 = count_kmers(input_str, 2, alphabet=''.join(alphabet))
+    for combo, count in zip(combos2, counts2.dense()):
         percentage = (100.0 * count / total_pairs) if total_pairs > 0 else 0.0
         print(f"{combo}: {percentage:.2f}% ({count} occurrences)")
 
     total_triplets = max(0, len(input_str) - 2)
     print("\n--- 3-character combinations ---")
-    for combo in combos3:
-        count = count_occurrences(input_str, combo)
+    # One pass over the text for all combinations (same counts as count_occurrences)
+    counts3 = count_kmers(input_str, 3, alphabet=''.join(alphabet))
+    for combo, count in zip(combos3, counts3.dense()):
         percentage = (100.0 * count / total_triplets) if total_triplets > 0 else 0.0
         print(f"{combo}: {percentage:.2f}% ({count} occurrences)")
 
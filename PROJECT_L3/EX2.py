@@ -1,6 +1,14 @@
 from tkinter import filedialog, Tk, Label, Button, messagebox
 import matplotlib.pyplot as plt
 import math
+import numpy as np
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from seqtools import melting
+from seqtools.downsample import DEFAULT_WIDTH_PX, decimate
+from seqtools.normalize import NUCLEOTIDES, normalize_sequence
 
 def basic_tm(S):
     A = S.count('A')
@@ -20,19 +28,13 @@ def advanced_tm(S, na=0.05):
     return round(tm, 2)
 
 def calculate_tm_signals(sequence, window_size=9, na=0.001):
-    tm_basic = []
-    tm_advanced = []
-
-    for i in range(len(sequence) - window_size + 1):
-        window = sequence[i:i+window_size]
-        tm_basic.append(basic_tm(window))
-        tm_advanced.append(advanced_tm(window, na))
-
-    return tm_basic, tm_advanced
+    # Same values as basic_tm / advanced_tm on every window, from prefix sums in O(n)
+    return melting.calculate_tm_signals(sequence, window_size, na)
 
-def show_chart(tm_basic, tm_advanced):
-    plt.plot(tm_basic, label="Basic Tm (4GC+2AT)")
-    plt.plot(tm_advanced, label="Advanced Tm (Salt-adjusted)")
+def show_chart(tm_basic, tm_advanced, width_px=DEFAULT_WIDTH_PX):
+    x = np.arange(len(tm_basic))
+    plt.plot(*decimate(x, tm_basic, width_px), label="Basic Tm (4GC+2AT)")
+    plt.plot(*decimate(x, tm_advanced, width_px), label="Advanced Tm (Salt-adjusted)")
     plt.title("Melting Temperature (Tm) - Sliding Window = 9")
     plt.xlabel("Window Start Position")
     plt.ylabel("Temperature (°C)")
@@ -49,7 +51,7 @@ def open_file():
         with open(filepath, "r") as file:
             lines = file.readlines()
             sequence = "".join([line.strip().upper() for line in lines if not line.startswith(">")])
-            sequence = "".join([base for base in sequence if base in ['A', 'T', 'C', 'G']])
+            sequence = normalize_sequence(sequence, alphabet=NUCLEOTIDES).sequence.decode('ascii')
 
             if len(sequence) < 9:
                 messagebox.showerror("Error", "Sequence too short. Minimum 9 bases required.")
@@ -1,6 +1,17 @@
 from tkinter import filedialog, Tk, Label, Button, Entry, messagebox
+import argparse
 import matplotlib.pyplot as plt
-import math
+import numpy as np
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from seqtools import melting
+from seqtools.downsample import DEFAULT_WIDTH_PX, decimate
+from seqtools.fasta import iter_fasta
+from seqtools.intervals import threshold_intervals
+from seqtools.normalize import NUCLEOTIDES, normalize_sequence
+from seqtools.primers import find_primers
 
 def basic_tm(S):
     A = S.count('A')
@@ -9,33 +20,18 @@ def basic_tm(S):
     C = S.count('C')
     return 4 * (G + C) + 2 * (A + T)
 
-def advanced_tm(S):
-    na = 0.001
-    length = len(S)
-    if length == 0:
-        return None
-    gc_count = S.count('G') + S.count('C')
-    gc_perc = (gc_count / length) * 100
-    log_na = math.log10(na)
-    tm = 81.5 + 16.6 * log_na + 0.41 * gc_perc - (600 / length)
-    return round(tm, 2)
-
 def calculate_tm_signals(sequence, window_size=9):
-    tm_basic = []
-    tm_advanced = []
-
-    for i in range(len(sequence) - window_size + 1):
-        window = sequence[i:i+window_size]
-        tm_basic.append(basic_tm(window))
-        tm_advanced.append(advanced_tm(window))
-
-    return tm_basic, tm_advanced
-
-def show_main_chart(tm_basic, tm_advanced, threshold):
-    x = list(range(len(tm_basic)))
+    # Wallace (same values as basic_tm) and SantaLucia nearest-neighbor Tm of
+    # every window, both from prefix sums in O(n), at 1 mM Na+
+    tm_basic = melting.wallace_tm(sequence, window_size)
+    tm_nn = melting.nearest_neighbor_tm(sequence, window_size, na=0.001)
+    return tm_basic, tm_nn
+
+def show_main_chart(tm_basic, tm_advanced, threshold, width_px=DEFAULT_WIDTH_PX):
+    x = np.arange(len(tm_basic))
     plt.figure(figsize=(10, 5))
-    plt.plot(x, tm_basic, label="Wallace Formula", color='blue')
-    plt.plot(x, tm_advanced, label="Nearest Neighbor", color='red')
+    plt.plot(*decimate(x, tm_basic, width_px), label="Wallace Formula", color='blue')
+    plt.plot(*decimate(x, tm_advanced, width_px), label="Nearest Neighbor", color='red')
     plt.axhline(y=threshold, color='gray', linestyle='--', label=f"Threshold = {threshold}°C")
     plt.title("Melting Temperature Profile (Window = 9)")
     plt.xlabel("Window Start Position")
@@ -46,14 +42,16 @@ def show_main_chart(tm_basic, tm_advanced, threshold):
     plt.tight_layout()
     plt.show()
 
-def show_threshold_chart(tm_basic, tm_advanced, threshold):
-    x = list(range(len(tm_basic)))
+def show_threshold_chart(tm_basic, tm_advanced, threshold, width_px=DEFAULT_WIDTH_PX):
+    x = np.arange(len(tm_basic))
+    x_basic, y_basic = decimate(x, tm_basic, width_px)
+    x_advanced, y_advanced = decimate(x, tm_advanced, width_px)
 
     plt.figure(figsize=(10, 5))
-    plt.fill_between(x, threshold, tm_basic, where=[val >= threshold for val in tm_basic],
+    plt.fill_between(x_basic, threshold, y_basic, where=y_basic >= threshold,
                      interpolate=True, color='blue', alpha=0.5, label="Wallace > threshold")
 
-    plt.fill_between(x, threshold, tm_advanced, where=[val >= threshold for val in tm_advanced],
+    plt.fill_between(x_advanced, threshold, y_advanced, where=y_advanced >= threshold,
                      interpolate=True, color='red', alpha=0.5, label="NN > threshold")
 
     plt.axhline(y=threshold, color='gray', linestyle='--', label=f"Threshold = {threshold}°C")
@@ -74,7 +72,7 @@ def open_file():
         with open(filepath, "r") as file:
             lines = file.readlines()
             sequence = "".join([line.strip().upper() for line in lines if not line.startswith(">")])
-            sequence = "".join([base for base in sequence if base in ['A', 'T', 'C', 'G']])
+            sequence = normalize_sequence(sequence, alphabet=NUCLEOTIDES).sequence.decode('ascii')
 
             if len(sequence) < 9:
                 messagebox.showerror("Error", "Sequence too short. Minimum 9 bases required.")
@@ -89,8 +87,14 @@ def open_file():
 
             tm_basic, tm_advanced =calculate_tm_signals(sequence, window_size=9)
 
-            print(f"Wallace Formula: Min = {min(tm_basic)} °C, Max = {max(tm_basic)} °C")
-            print(f"Nearest Neighbor: Min = {min(tm_advanced)} °C, Max = {max(tm_advanced)} °C")
+            print(f"Wallace Formula: Min = {tm_basic.min()} °C, Max = {tm_basic.max()} °C")
+            print(f"Nearest Neighbor: Min = {np.nanmin(tm_advanced)} °C, Max = {np.nanmax(tm_advanced)} °C")
+
+            for name, values in (("Wallace Formula", tm_basic), ("Nearest Neighbor", tm_advanced)):
+                intervals = threshold_intervals(values, threshold)
+                print(f"{name}: {len(intervals)} segment(s) >= {threshold} °C")
+                for interval in intervals[:10]:
+                    print(f"  windows {interval.start}-{interval.end - 1}, peak {interval.peak:.2f} °C")
 
             show_main_chart(tm_basic, tm_advanced, threshold)
             show_threshold_chart(tm_basic, tm_advanced, threshold)
@@ -98,21 +102,65 @@ def open_file():
     except Exception as e:
         messagebox.showerror("Error", f"Failed to process file:\n{e}")
 
-root = Tk()
-root.title("DNA Melting Temperature Analyzer")
-root.geometry("500x250")
-
-label = Label(root, text="Select a FASTA file to analyze", font=("Arial", 12))
-label.pack(pady=10)
-
-button = Button(root, text="Open FASTA File", font=("Arial", 12), command=open_file)
-button.pack()
-
-label_thresh = Label(root, text="Set Threshold (°C) for Filtered View:", font=("Arial", 11))
-label_thresh.pack(pady=10)
-
-entry_threshold = Entry(root, font=("Arial", 11))
-entry_threshold.insert(0, "5")
-entry_threshold.pack()
-
-root.mainloop()
+def run_primers(argv=None):
+    """
+    Primer mode: the best primer candidates of every record of a FASTA file,
+    filtered by Tm, GC content, homopolymer runs and the 3' GC clamp and
+    ranked by their distance to the middle of the Tm range.
+    """
+    parser = argparse.ArgumentParser(description="Primer candidates of every record in a FASTA file.")
+    parser.add_argument("fasta", help="FASTA file")
+    parser.add_argument("--min-length", type=int, default=18, help="shortest primer (default: 18)")
+    parser.add_argument("--max-length", type=int, default=25, help="longest primer (default: 25)")
+    parser.add_argument("--tm", type=float, nargs=2, default=(55.0, 65.0), metavar=("MIN", "MAX"),
+                        help="Tm range in °C (default: 55 65)")
+    parser.add_argument("--gc", type=float, nargs=2, default=(40.0, 60.0), metavar=("MIN", "MAX"),
+                        help="GC range in percent (default: 40 60)")
+    parser.add_argument("--method", choices=melting.TM_METHODS, default="nn", help="Tm method")
+    parser.add_argument("--max-homopolymer", type=int, default=4, help="longest run of one base")
+    parser.add_argument("--region", type=int, help="report the best primers of every region of this many bases")
+    parser.add_argument("--top", type=int, default=5, help="candidates per region (default: 5)")
+    args = parser.parse_args(argv)
+    if args.max_homopolymer < 1:
+        parser.error("--max-homopolymer must be at least 1")
+
+    for header, sequence in iter_fasta(args.fasta):
+        sequence = normalize_sequence(sequence.upper(), alphabet=NUCLEOTIDES).sequence.decode('ascii')
+        print(f">{header}")
+        regions = find_primers(sequence, lengths=range(args.min_length, args.max_length + 1),
+                               tm_range=tuple(args.tm), gc_range=tuple(args.gc), method=args.method,
+                               max_homopolymer=args.max_homopolymer, region_size=args.region, top_n=args.top)
+        if not regions:
+            print("  no primer candidates")
+        for region_start, candidates in regions.items():
+            if args.region:
+                print(f"  region {region_start}-{region_start + args.region - 1}")
+            for c in candidates:
+                print(f"  {c.start:>8}  {c.sequence:<{args.max_length}}  Tm {c.tm:6.2f} °C  "
+                      f"GC {c.gc_percent:5.1f}%  penalty {c.penalty:.2f}")
+    return 0
+
+if __name__ == "__main__":
+    # With arguments search primers (python EX3.py lab3.fasta --tm 55 65),
+    # otherwise open the GUI.
+    if len(sys.argv) > 1:
+        sys.exit(run_primers())
+
+    root = Tk()
+    root.title("DNA Melting Temperature Analyzer")
+    root.geometry("500x250")
+
+    label = Label(root, text="Select a FASTA file to analyze", font=("Arial", 12))
+    label.pack(pady=10)
+
+    button = Button(root, text="Open FASTA File", font=("Arial", 12), command=open_file)
+    button.pack()
+
+    label_thresh = Label(root, text="Set Threshold (°C) for Filtered View:", font=("Arial", 11))
+    label_thresh.pack(pady=10)
+
+    entry_threshold = Entry(root, font=("Arial", 11))
+    entry_threshold.insert(0, "5")
+    entry_threshold.pack()
+
+    root.mainloop()
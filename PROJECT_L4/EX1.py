@@ -1,3 +1,9 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from seqtools.codons import DNA, CodonTable
+from seqtools.orfs import iter_orfs
 
 GENETIC_CODE = {
     # U-block
@@ -22,6 +28,8 @@ GENETIC_CODE = {
     'GGU': 'Gly', 'GGC': 'Gly', 'GGA': 'Gly', 'GGG': 'Gly'
 }
 
+CODON_TABLE = CodonTable(GENETIC_CODE)
+
 # 2. Transcription Function (DNA -> RNA)
 def transcribe(dna_sequence):
     """
@@ -38,39 +46,25 @@ def translate(rna_sequence):
     Translation starts at the first 'AUG' (Met) codon and stops
     when a 'STOP' codon is encountered.
     """
-    protein = []
-    is_translating = False
+    # All codons from the start codon on are encoded as indices 0-63 and
+    # translated with one NumPy lookup (see seqtools.codons)
+    protein = CODON_TABLE.translate(rna_sequence)
 
-    # Find the first start codon 'AUG'
-    start_index = rna_sequence.find('AUG')
-    
-    if start_index == -1:
+    if protein is None:
         # If no start codon is found, translation cannot begin
         return "No start codon (AUG) found in sequence."
 
-    # Iterate over the RNA sequence in steps of 3 (one codon at a time)
-    # Start iterating from the 'AUG' codon
-    for i in range(start_index, len(rna_sequence), 3):
-        # Get the 3-letter codon
-        codon = rna_sequence[i:i+3]
-
-        # Ensure we have a full codon
-        if len(codon) < 3:
-            break  # Reached the end of the sequence
-
-        # Look up the codon in the genetic code table
-        # .get(codon, 'X') returns 'X' (unknown) if the codon is not found
-        amino_acid = GENETIC_CODE.get(codon, 'X')
-
-        # Check for stop codon
-        if amino_acid == 'STOP':
-            break  # Stop translation
-        
-        # Add the amino acid to our protein sequence
-        protein.append(amino_acid)
+    # Amino acids up to the first STOP codon, separated by dashes
+    return protein
 
-    # Join the list of amino acids into a single string, separated by dashes
-    return "-".join(protein)
+# 4. Six-Frame ORF Search (DNA -> ORFs on both strands)
+def find_orfs(dna_sequence, min_length=100):
+    """
+    Finds the open reading frames (AUG ... STOP) in all three frames of both
+    strands of a DNA coding strand. Yields ORFs with forward-strand
+    coordinates, strand, frame and protein, ordered by start position.
+    """
+    return iter_orfs(dna_sequence.upper(), min_length, CodonTable(GENETIC_CODE, alphabet=DNA))
 
 # --- Main Application ---
 if __name__ == "__main__":
@@ -88,4 +82,10 @@ if __name__ == "__main__":
 
     # Step 2: Translate RNA to Protein
     protein_sequence = translate(rna_sequence)
-    print(f"Translated Protein Sequence: {protein_sequence}")
\ No newline at end of file
+    print(f"Translated Protein Sequence: {protein_sequence}")
+    print("-" * 30)
+
+    # Step 3: ORFs in all six reading frames
+    print("Open Reading Frames (6 frames, >= 3 codons):")
+    for orf in find_orfs(dna_coding_strand, min_length=3):
+        print(f"  {orf.strand}{orf.frame} {orf.start}-{orf.end}: {orf.protein}")
@@ -1,9 +1,18 @@
 import sys
 import os
+import argparse
+import csv
 from collections import Counter
+import numpy as np
 import matplotlib.pyplot as plt
 # Note: urllib and json imports have been removed.
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from seqtools.cache import load_fasta_cached
+from seqtools.codon_usage import (amino_acid_matrix, cai, codon_count_matrix, codon_names, frame_codon_counts,
+                                  relative_adaptiveness, rscu, usage_distances)
+from seqtools.codons import DNA, CodonTable
+
 # 1. The Genetic Code Table (from your image)
 GENETIC_CODE = {
     # U-block
@@ -28,6 +37,10 @@ GENETIC_CODE = {
     'GGU': 'Gly', 'GGC': 'Gly', 'GGA': 'Gly', 'GGG': 'Gly'
 }
 
+# Built once: the code as lookup tables and its 64 x 21 codon -> amino acid matrix
+CODON_TABLE = CodonTable(GENETIC_CODE, alphabet=DNA)
+AMINO_ACID_MATRIX, AMINO_ACIDS = amino_acid_matrix(CODON_TABLE)
+
 # 2. Pre-loaded Food Information Database
 AMINO_ACID_INFO = {
     'Leu': "Leucine: An essential amino acid. Found in high-protein foods (meat, dairy, soy). Some grains like corn are lower in leucine.",
@@ -67,7 +80,8 @@ LOW_PROTEIN_FOODS = {
 def parse_fasta(filename):
     """
     Parses a FASTA file and returns the complete genome sequence as a
-    single, uppercase string.
+    single, uppercase string. Parsed genomes are cached on disk, so repeated
+    runs skip the text parsing.
     """
     if not os.path.exists(filename):
         print(f"Error: File not found at '{filename}'", file=sys.stderr)
@@ -75,14 +89,7 @@ def parse_fasta(filename):
         sys.exit(1)
         
     print(f"Parsing {filename}...")
-    sequence = []
-    with open(filename, 'r') as f:
-        for line in f:
-            if line.startswith('>'):
-                continue
-            sequence.append(line.strip())
-            
-    return "".join(sequence).upper()
+    return "".join(str(seq) for _, seq in load_fasta_cached(filename))
 
 def transcribe(dna_sequence):
     """
@@ -90,23 +97,36 @@ def transcribe(dna_sequence):
     """
     return dna_sequence.replace('T', 'U')
 
-def get_codon_frequencies(rna_sequence):
+def get_codon_counts(dna_sequence, frames=(0,)):
+    """
+    Counts the codons in the given reading frames of a DNA sequence, as an
+    array of 64 counts in codon_names() order. All three frames are counted
+    in one bincount pass over the DNA, without building the RNA string;
+    codons containing other letters than A, C, G, T are skipped.
+    """
+    return frame_codon_counts(dna_sequence, alphabet=DNA)[list(frames)].sum(axis=0)
+
+def codon_counter(codon_counts):
     """
-    Counts the frequency of each 3-letter codon in an RNA sequence.
+    Turns an array of codon counts into a Counter keyed by the codon written as RNA.
     """
-    codons = [rna_sequence[i:i+3] for i in range(0, len(rna_sequence) - 2, 3)]
-    return Counter(codons)
+    return Counter({codon: int(count) for codon, count in zip(codon_names(), codon_counts) if count})
 
-def get_amino_acid_frequencies(codon_counts, genetic_code):
+def get_codon_frequencies(dna_sequence, frames=(0,)):
     """
-    Calculates the total frequency of each amino acid based on codon counts.
+    Counts the frequency of each 3-letter codon (written as RNA) in the
+    given reading frames of a DNA sequence.
     """
-    amino_acid_counts = Counter()
-    for codon, count in codon_counts.items():
-        amino_acid = genetic_code.get(codon)
-        if amino_acid and amino_acid != 'STOP':
-            amino_acid_counts[amino_acid] += count
-    return amino_acid_counts
+    return codon_counter(get_codon_counts(dna_sequence, frames))
+
+def get_amino_acid_frequencies(codon_counts):
+    """
+    Calculates the total frequency of each amino acid from an array of
+    codon counts (see get_codon_counts), as one product with the
+    64 x 21 codon -> amino acid matrix.
+    """
+    totals = codon_counts @ AMINO_ACID_MATRIX
+    return Counter({aa: int(total) for aa, total in zip(AMINO_ACIDS, totals) if total and aa != 'STOP'})
 
 def plot_top_codons(codon_counts, title, top_n=10):
     """
@@ -172,16 +192,16 @@ def main():
 
     # --- COVID-19 Analysis ---
     covid_dna = parse_fasta(COVID_FASTA)
-    covid_rna = transcribe(covid_dna)
-    covid_codon_counts = get_codon_frequencies(covid_rna)
-    covid_aa_counts = get_amino_acid_frequencies(covid_codon_counts, GENETIC_CODE)
+    covid_counts = get_codon_counts(covid_dna)
+    covid_codon_counts = codon_counter(covid_counts)
+    covid_aa_counts = get_amino_acid_frequencies(covid_counts)
     plot_top_codons(covid_codon_counts, "Top 10 Most Frequent Codons: COVID-19")
 
     # --- Influenza Analysis ---
     flu_dna = parse_fasta(INFLUENZA_FASTA)
-    flu_rna = transcribe(flu_dna)
-    flu_codon_counts = get_codon_frequencies(flu_rna)
-    flu_aa_counts = get_amino_acid_frequencies(flu_codon_counts, GENETIC_CODE)
+    flu_counts = get_codon_counts(flu_dna)
+    flu_codon_counts = codon_counter(flu_counts)
+    flu_aa_counts = get_amino_acid_frequencies(flu_counts)
     plot_top_codons(flu_codon_counts, "Top 10 Most Frequent Codons: Influenza")
 
     # --- Console Output ---
@@ -223,5 +243,70 @@ def main():
     print("Please close the chart windows to exit the program.")
     plt.show()
 
+def write_matrix_csv(path, names, columns, matrix, fmt="{:g}"):
+    """
+    Writes one row per genome: its name, then one value per column.
+    """
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["genome"] + list(columns))
+        for name, row in zip(names, matrix.tolist()):
+            writer.writerow([name] + [fmt.format(value) for value in row])
+
+def run_batch(argv=None):
+    """
+    Batch mode: codon usage of every genome (FASTA record) in the given
+    directories / multi-FASTA files.
+
+    Builds the genomes x 64 codon count matrix in parallel, then derives
+    RSCU, CAI (weights from --reference, or from all genomes pooled) and
+    the pairwise codon-usage distances with matrix operations, and writes
+    codon_counts.csv, rscu.csv, cai.csv and distances.npy to --out.
+    """
+    parser = argparse.ArgumentParser(description="Codon usage (counts, RSCU, CAI, distances) of many genomes.")
+    parser.add_argument("inputs", nargs="+", help="directories of FASTA files or (multi-)FASTA files")
+    parser.add_argument("--out", default="codon_usage", help="output directory (default: codon_usage)")
+    parser.add_argument("--reference", help="FASTA of reference genes for the CAI weights (default: all genomes)")
+    parser.add_argument("--metric", choices=["euclidean", "cosine"], default="euclidean",
+                        help="distance between RSCU profiles")
+    parser.add_argument("--frame", type=int, default=0, choices=[0, 1, 2], help="reading frame")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="worker processes")
+    args = parser.parse_args(argv)
+
+    names, counts = codon_count_matrix(args.inputs, frame=args.frame, workers=args.workers)
+    if not names:
+        print("Error: no FASTA records found.", file=sys.stderr)
+        return 1
+    print(f"Counted codons of {len(names)} genome(s).")
+
+    if args.reference:
+        reference = codon_count_matrix(args.reference, frame=args.frame, workers=args.workers)[1]
+    else:
+        reference = counts
+    rscu_values = rscu(counts, CODON_TABLE)
+    cai_values = cai(counts, relative_adaptiveness(reference, CODON_TABLE), CODON_TABLE)
+    distances = usage_distances(rscu_values, args.metric)
+
+    os.makedirs(args.out, exist_ok=True)
+    codons = codon_names()
+    write_matrix_csv(os.path.join(args.out, "codon_counts.csv"), names, codons, counts)
+    write_matrix_csv(os.path.join(args.out, "rscu.csv"), names, codons, rscu_values, "{:.4f}")
+    write_matrix_csv(os.path.join(args.out, "cai.csv"), names, ["cai"], cai_values[:, None], "{:.4f}")
+    np.save(os.path.join(args.out, "distances.npy"), distances)
+    print(f"Results written to '{args.out}' (distances.npy rows follow codon_counts.csv).")
+
+    # Most similar pairs, from the upper triangle of the distance matrix
+    if len(names) > 1:
+        rows, cols = np.triu_indices(len(names), k=1)
+        closest = np.argsort(distances[rows, cols], kind="stable")[:5]
+        print(f"\n--- Most similar codon usage ({args.metric} distance of RSCU) ---")
+        for i in closest:
+            print(f"{distances[rows[i], cols[i]]:.4f}  {names[rows[i]]}  <->  {names[cols[i]]}")
+    return 0
+
 if __name__ == "__main__":
+    # With arguments run the batch mode (python EX2.py genomes/ --out results),
+    # otherwise compare the two bundled genomes.
+    if len(sys.argv) > 1:
+        sys.exit(run_batch())
     main()
@@ -4,6 +4,10 @@ import matplotlib.pyplot as plt
 import matplotlib.patches as patches
 import re
 import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from seqtools.fasta import iter_fasta_parallel
 
 
 def read_multi_fasta(filepath):
@@ -17,26 +21,11 @@ def read_multi_fasta(filepath):
 
     print(f"Reading sequences from {filepath}...")
     sequences = {}
-    current_seq = ""
-    current_header = ""
 
-    with open(filepath, 'r') as f:
-        for line in f:
-            line = line.strip()
-            if not line:
-                continue
-            
-            if line.startswith('>'):
-                if current_header and current_seq:
-                    sequences[current_header] = current_seq
-                
-                current_header = line[1:].split(' ')[0] 
-                current_seq = ""
-            else:
-                current_seq += line
-        
-        if current_header and current_seq:
-            sequences[current_header] = current_seq
+    for header, sequence in iter_fasta_parallel(filepath):
+        current_header = header.split(' ')[0]
+        if current_header and sequence:
+            sequences[current_header] = sequence
             
     print(f"Successfully read {len(sequences)} sequences.")
     return sequences
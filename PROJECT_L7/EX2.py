@@ -5,32 +5,17 @@ import textwrap
 import os
 import sys
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from seqtools.fasta import iter_fasta_parallel
+
 def read_multi_fasta(fasta_file):
     
     sequences = {}
-    current_header = None
-    current_sequence = []
     
     try:
-        with open(fasta_file, 'r') as f:
-            for line in f:
-                line = line.strip()
-                if not line:
-                    continue
-                
-                if line.startswith('>'):
-                    if current_header and current_sequence:
-                        sequences[current_header] = "".join(current_sequence).upper()
-                    
-                   
-                    current_header = line[1:].split()[0]
-                    current_sequence = []
-                else:
-                    current_sequence.append(line)
-        
-        
-        if current_header and current_sequence:
-            sequences[current_header] = "".join(current_sequence).upper()
+        for header, sequence in iter_fasta_parallel(fasta_file):
+            if header and sequence:
+                sequences[header.split()[0]] = sequence.upper()
             
     except FileNotFoundError:
         print(f"Error: The file '{fasta_file}' was not found.")
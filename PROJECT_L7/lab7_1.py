@@ -2,20 +2,19 @@ import sys
 import os
 from collections import defaultdict
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from seqtools.fasta import iter_fasta
+
 def extract_sequence(fasta_file):
 
     try:
-        with open(fasta_file, 'r') as f:
-            lines = [line.strip() for line in f if not line.startswith('>')]
+        sequence = "".join(seq for _, seq in iter_fasta(fasta_file)).upper()
         
        
-        if not lines:
+        if not sequence:
             print(f"Error: No sequence found in {fasta_file}. The file might be empty or improperly formatted.")
             return None
-            
-        
-        sequence = "".join(lines).upper()
-        
+
        
         if any(base not in 'ATCG' for base in sequence):
             print("Warning: The sequence contains non-standard DNA bases. Proceeding, but results might be unexpected.")
@@ -1,7 +1,11 @@
 import os
+import sys
 from Bio import SeqIO
 from Bio.Seq import Seq
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from seqtools.fasta import open_fasta
+
 
 MIN_IR_LENGTH = 4
 MAX_IR_LENGTH = 6
@@ -68,9 +72,10 @@ def process_genomes(genome_files):
         
         
         try:
-            for record in SeqIO.parse(file_path, "fasta"):
-                te_detections = find_inverted_repeats(record)
-                all_results.extend(te_detections)
+            with open_fasta(file_path) as handle:
+                for record in SeqIO.parse(handle, "fasta"):
+                    te_detections = find_inverted_repeats(record)
+                    all_results.extend(te_detections)
                 
         except FileNotFoundError:
             print(f"ERROR: File not found at {file_path}. Skipping.")
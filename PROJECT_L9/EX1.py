@@ -1,7 +1,11 @@
 import os
+import sys
 import math
 import matplotlib.pyplot as plt
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from seqtools.fasta import iter_fasta
+
 ENZYMES = {
     "EcoRI":  ("GAATTC", 1),
     "BamHI":  ("GGATCC", 1),
@@ -11,14 +15,7 @@ ENZYMES = {
 }
 
 def read_fasta(path):
-    s = []
-    with open(path) as f:
-        for line in f:
-            line = line.strip()
-            if not line or line.startswith(">"):
-                continue
-            s.append(line.upper())
-    return "".join(s)
+    return "".join(seq for _, seq in iter_fasta(path)).upper()
 
 def find_sites(seq, pat, cut):
     p = []
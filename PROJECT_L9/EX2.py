@@ -1,8 +1,12 @@
 
 import os
+import sys
 import math
 import matplotlib.pyplot as plt
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from seqtools.cache import load_fasta_cached
+
 ENZYMES = {
     "EcoRI":  ("GAATTC", 1),
     "BamHI":  ("GGATCC", 1),
@@ -12,14 +16,7 @@ ENZYMES = {
 }
 
 def read_fasta(path):
-    s = []
-    with open(path) as f:
-        for line in f:
-            line = line.strip()
-            if not line or line.startswith(">"):
-                continue
-            s.append(line.upper())
-    return "".join(s)
+    return "".join(str(seq) for _, seq in load_fasta_cached(path))
 
 def find_sites(seq, pat, cut):
     p = []
@@ -0,0 +1,49 @@
+"""
+Benchmark: count_kmers_parallel scaling from 1 to N worker processes on a
+synthetic genome.
+
+Usage:
+    python benchmarks/bench_kmer_parallel.py [size_mbp] [k ...]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from seqtools.kmers import DENSE_LIMIT, count_kmers_parallel
+
+
+def synthetic_genome(n_bases, seed=42):
+    rng = np.random.default_rng(seed)
+    return np.frombuffer(b"ACGT", dtype=np.uint8)[rng.integers(0, 4, n_bases)].tobytes()
+
+
+def main():
+    size_mbp = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    ks = [int(k) for k in sys.argv[2:]] or [11, 21]
+
+    print(f"Generating {size_mbp} Mbp...")
+    genome = synthetic_genome(size_mbp * 1_000_000)
+
+    for k in ks:
+        table = "dense" if 4 ** k <= DENSE_LIMIT else "sparse"
+        print(f"\nk={k} ({table} table)")
+        print(f"{'workers':>8} | {'seconds':>8} | {'speedup':>7} | {'Mbp/s':>7}")
+        baseline = None
+        reference = None
+        workers = 1
+        while workers <= (os.cpu_count() or 1):
+            t0 = time.perf_counter()
+            counts = count_kmers_parallel(genome, k, workers=workers)
+            elapsed = time.perf_counter() - t0
+            if reference is None:
+                baseline, reference = elapsed, counts
+            assert counts == reference, "counts differ between worker counts"
+            print(f"{workers:>8} | {elapsed:8.2f} | {baseline / elapsed:7.2f} | {size_mbp / elapsed:7.1f}")
+            workers *= 2
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+Benchmark: serial iter_fasta vs iter_fasta_parallel on a synthetic multi-FASTA.
+
+Usage:
+    python benchmarks/bench_parallel_fasta.py [size_mb] [records]
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from seqtools.fasta import iter_fasta, iter_fasta_parallel
+
+
+def write_synthetic_fasta(path, total_bases, n_records, line_width=60):
+    rng = random.Random(42)
+    per_record = total_bases // n_records
+    line = "".join(rng.choice("ACGT") for _ in range(line_width * 1000))
+    with open(path, 'w') as f:
+        for r in range(n_records):
+            f.write(f">segment_{r} synthetic genome\n")
+            remaining = per_record
+            while remaining > 0:
+                start = rng.randrange(0, len(line) - line_width)
+                n = min(line_width, remaining)
+                f.write(line[start:start + n] + "\n")
+                remaining -= n
+
+
+def main():
+    size_mb = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    n_records = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "pangenome.fa")
+        print(f"Writing {size_mb} Mbp in {n_records} records...")
+        write_synthetic_fasta(path, size_mb * 1_000_000, n_records)
+
+        t0 = time.perf_counter()
+        serial = list(iter_fasta(path))
+        serial_time = time.perf_counter() - t0
+        print(f"{'workers':>8} | {'seconds':>8} | {'speedup':>7}")
+        print(f"{'serial':>8} | {serial_time:8.2f} | {1.0:7.2f}")
+
+        workers = 1
+        while workers <= (os.cpu_count() or 1):
+            t0 = time.perf_counter()
+            records = list(iter_fasta_parallel(path, workers=workers, chunk_bytes=16 << 20))
+            elapsed = time.perf_counter() - t0
+            assert records == serial, "parallel output differs from the serial reader"
+            print(f"{workers:>8} | {elapsed:8.2f} | {serial_time / elapsed:7.2f}")
+            workers *= 2
+
+
+if __name__ == "__main__":
+    main()
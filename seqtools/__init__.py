@@ -0,0 +1,6 @@
+"""
+Shared sequence utilities used by the PROJECT_L* lab scripts.
+
+The lab scripts are run from inside their own folders, so they put the
+repository root on sys.path before importing from this package.
+"""
@@ -0,0 +1,161 @@
+import bisect
+import os
+import struct
+import zlib
+from typing import Union
+
+GZIP_MAGIC = b'\x1f\x8b'
+
+# gzip member header with FEXTRA set and a 'BC' subfield holding BSIZE.
+_BGZF_HEADER = struct.Struct('<4sIBBHBBHH')
+_BGZF_EOF = bytes.fromhex('1f8b08040000000000ff0600424302001b0003000000000000000000')
+_MAX_BLOCK_DATA = 0xff00
+
+
+def read_magic(source: Union[str, os.PathLike], size: int = 18) -> bytes:
+    with open(source, 'rb') as f:
+        return f.read(size)
+
+
+def is_gzip(source: Union[str, os.PathLike]) -> bool:
+    """True if the file starts with the gzip magic bytes (plain gzip or BGZF)."""
+    return read_magic(source, 2) == GZIP_MAGIC
+
+
+def is_bgzf(source: Union[str, os.PathLike]) -> bool:
+    """True if the file is blocked gzip (bgzip output), which supports random access."""
+    return _parse_block_header(read_magic(source)) is not None
+
+
+def _parse_block_header(header: bytes):
+    """Returns the total block size (BSIZE + 1) of a BGZF block header, or None."""
+    if len(header) < _BGZF_HEADER.size:
+        return None
+    magic, _mtime, _xfl, _os, xlen, si1, si2, slen, bsize = _BGZF_HEADER.unpack(header)
+    if magic != b'\x1f\x8b\x08\x04' or xlen != 6 or (si1, si2, slen) != (66, 67, 2):
+        return None
+    return bsize + 1
+
+
+def read_gzi(gzi_path: str) -> list[tuple[int, int]]:
+    """Reads a bgzip .gzi index into (compressed_offset, uncompressed_offset) pairs."""
+    with open(gzi_path, 'rb') as f:
+        (count,) = struct.unpack('<Q', f.read(8))
+        data = f.read(16 * count)
+    pairs = [(0, 0)]
+    pairs.extend(struct.iter_unpack('<QQ', data))
+    return pairs
+
+
+def scan_blocks(path: str) -> list[tuple[int, int]]:
+    """
+    Walks the block headers of a BGZF file without decompressing anything.
+
+    Returns:
+        (compressed_offset, uncompressed_offset) for the start of every block.
+    """
+    blocks = []
+    coffset = uoffset = 0
+    with open(path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        while coffset < size:
+            f.seek(coffset)
+            block_size = _parse_block_header(f.read(_BGZF_HEADER.size))
+            if block_size is None:
+                raise ValueError(f"{path} is not a valid BGZF file (bad block at byte {coffset})")
+            f.seek(coffset + block_size - 4)
+            (isize,) = struct.unpack('<I', f.read(4))
+            blocks.append((coffset, uoffset))
+            coffset += block_size
+            uoffset += isize
+    return blocks
+
+
+class BgzfReader:
+    """
+    Random access into the uncompressed contents of a BGZF file.
+
+    Only the blocks that overlap a requested range are read and inflated.
+    The block table comes from '<path>.gzi' when bgzip wrote one, otherwise
+    it is built by hopping over the block headers.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        gzi_path = path + '.gzi'
+        if os.path.exists(gzi_path) and os.path.getmtime(gzi_path) >= os.path.getmtime(path):
+            blocks = read_gzi(gzi_path)
+        else:
+            blocks = scan_blocks(path)
+        self._coffsets = [c for c, _ in blocks]
+        self._uoffsets = [u for _, u in blocks]
+        self._file = open(path, 'rb')
+        self._cached_block = (-1, b"")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self) -> None:
+        self._file.close()
+
+    def _block(self, i: int) -> bytes:
+        if self._cached_block[0] == i:
+            return self._cached_block[1]
+        self._file.seek(self._coffsets[i])
+        header = self._file.read(_BGZF_HEADER.size)
+        block_size = _parse_block_header(header)
+        payload = self._file.read(block_size - _BGZF_HEADER.size)
+        data = zlib.decompress(payload[:-8], -15)
+        self._cached_block = (i, data)
+        return data
+
+    def read(self, offset: int, size: int) -> bytes:
+        """Returns `size` uncompressed bytes starting at uncompressed `offset`."""
+        i = bisect.bisect_right(self._uoffsets, offset) - 1
+        if i < 0 or size <= 0:
+            return b""
+        parts = []
+        skip = offset - self._uoffsets[i]
+        while size > 0 and i < len(self._coffsets):
+            data = self._block(i)[skip:skip + size]
+            parts.append(data)
+            size -= len(data)
+            skip = 0
+            i += 1
+        return b"".join(parts)
+
+
+def bgzip_file(src_path: str, dst_path: str) -> None:
+    """
+    Compresses a file (plain or gzip) into BGZF so it can be randomly
+    accessed, like `bgzip` from htslib. Also writes '<dst_path>.gzi'.
+    """
+    import gzip
+
+    opener = gzip.open if is_gzip(src_path) else open
+    index = []
+    coffset = uoffset = 0
+    with opener(src_path, 'rb') as src, open(dst_path, 'wb') as dst:
+        while True:
+            data = src.read(_MAX_BLOCK_DATA)
+            if not data:
+                break
+            compressor = zlib.compressobj(6, zlib.DEFLATED, -15)
+            payload = compressor.compress(data) + compressor.flush()
+            block = (_BGZF_HEADER.pack(b'\x1f\x8b\x08\x04', 0, 0, 0xff, 6, 66, 67, 2,
+                                       _BGZF_HEADER.size + len(payload) + 8 - 1)
+                     + payload + struct.pack('<II', zlib.crc32(data), len(data)))
+            if coffset:
+                index.append((coffset, uoffset))
+            dst.write(block)
+            coffset += len(block)
+            uoffset += len(data)
+        dst.write(_BGZF_EOF)
+
+    with open(dst_path + '.gzi', 'wb') as f:
+        f.write(struct.pack('<Q', len(index)))
+        for pair in index:
+            f.write(struct.pack('<QQ', *pair))
@@ -0,0 +1,203 @@
+import hashlib
+import json
+import os
+import time
+
+import numpy as np
+
+from seqtools.fasta import iter_fasta
+from seqtools.packed import PackedSequence
+
+DEFAULT_CACHE_DIR = os.environ.get(
+    'SEQTOOLS_CACHE', os.path.join(os.path.expanduser('~'), '.cache', 'seqtools'))
+DEFAULT_MAX_BYTES = int(os.environ.get('SEQTOOLS_CACHE_MAX_BYTES', 2 * 1024 ** 3))
+
+_FORMAT_VERSION = 3
+_PATHS_FILE = 'paths.json'
+
+
+def file_digest(path: str, chunk_size: int = 1 << 20) -> str:
+    """Returns the BLAKE2b hex digest of a file's bytes, read in chunks."""
+    digest = hashlib.blake2b(digest_size=20)
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _write_json(path: str, data) -> None:
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(data, f)
+    os.replace(tmp_path, path)
+
+
+class GenomeCache:
+    """
+    On-disk cache of parsed FASTA files, stored as 2-bit packed sequences.
+
+    Every parsed file is kept as '<digest>.npy' (the packed bases of all
+    records), '<digest>.runs.npy' (the non-ACGT runs) and a '<digest>.json'
+    sidecar with the headers and record layout, where <digest> is the hash
+    of the file contents. 'paths.json' maps each source path to its size,
+    mtime and digest, so an unchanged file is found from a stat() call alone
+    and the file is only re-hashed when its size or mtime change. Identical
+    files at different paths share one entry.
+
+    Entries are evicted least-recently-used first once the cache grows past
+    `max_bytes`. The packed arrays are memory-mapped on load.
+
+    Usage:
+        cache = GenomeCache()
+        for header, seq in cache.load("covid.fasta"):
+            sequence = str(seq)
+    """
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+
+    def _file(self, name: str) -> str:
+        return os.path.join(self.cache_dir, name)
+
+    def _read_paths(self) -> dict:
+        try:
+            with open(self._file(_PATHS_FILE), 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _digest_for(self, path: str) -> str:
+        """Returns the content digest of `path`, re-hashing only when its stat changed."""
+        stat = os.stat(path)
+        key = os.path.abspath(path)
+        paths = self._read_paths()
+        known = paths.get(key)
+        if known and known['size'] == stat.st_size and known['mtime_ns'] == stat.st_mtime_ns:
+            return known['digest']
+
+        digest = file_digest(path)
+        paths[key] = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'digest': digest}
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            _write_json(self._file(_PATHS_FILE), paths)
+        except OSError:
+            pass
+        return digest
+
+    def _read_entry(self, digest: str):
+        meta_path = self._file(digest + '.json')
+        try:
+            with open(meta_path, 'r') as f:
+                meta = json.load(f)
+            if meta.get('version') != _FORMAT_VERSION:
+                return None
+            packed = np.load(self._file(digest + '.npy'), mmap_mode='r')
+            runs = np.load(self._file(digest + '.runs.npy'))
+        except (OSError, ValueError):
+            return None
+
+        now = time.time()
+        try:
+            os.utime(meta_path, (now, now))  # Marks the entry as recently used.
+        except OSError:
+            pass
+
+        records = []
+        for rec in meta['records']:
+            start = rec['byte_offset']
+            rec_packed = packed[start:start + (rec['length'] + 3) // 4]
+            rec_runs = runs[rec['run_offset']:rec['run_offset'] + rec['run_count']]
+            records.append((rec['header'], PackedSequence(rec_packed, rec['length'], 0, rec_runs, rec['rna'])))
+        return records
+
+    def _write_entry(self, digest: str, source: str, records: list) -> None:
+        packed_parts, run_parts, layout = [], [], []
+        byte_offset = run_offset = 0
+        for header, seq in records:
+            packed, runs = seq.buffers()
+            packed_parts.append(packed)
+            run_parts.append(runs)
+            layout.append({'header': header, 'length': len(seq), 'byte_offset': byte_offset,
+                           'run_offset': run_offset, 'run_count': len(runs), 'rna': seq.rna})
+            byte_offset += len(packed)
+            run_offset += len(runs)
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        packed_all = np.concatenate(packed_parts) if packed_parts else np.empty(0, dtype=np.uint8)
+        runs_all = np.concatenate(run_parts) if run_parts else np.empty((0, 3), dtype=np.int64)
+        # Arrays first, sidecar last: a sidecar only exists for a complete entry.
+        np.save(self._file(digest + '.npy'), packed_all)
+        np.save(self._file(digest + '.runs.npy'), runs_all)
+        _write_json(self._file(digest + '.json'),
+                    {'version': _FORMAT_VERSION, 'source': os.path.abspath(source), 'records': layout})
+
+    def _entry_sizes(self) -> list[tuple[float, int, str]]:
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith('.json') or name == _PATHS_FILE:
+                continue
+            digest = name[:-len('.json')]
+            size = 0
+            for suffix in ('.json', '.npy', '.runs.npy'):
+                try:
+                    size += os.path.getsize(self._file(digest + suffix))
+                except OSError:
+                    pass
+            entries.append((os.path.getmtime(self._file(name)), size, digest))
+        return entries
+
+    def evict(self, keep: str = None) -> None:
+        """Deletes least-recently-used entries until the cache fits in max_bytes."""
+        entries = sorted(self._entry_sizes())
+        total = sum(size for _, size, _ in entries)
+        for _, size, digest in entries:
+            if total <= self.max_bytes:
+                break
+            if digest == keep:
+                continue
+            for suffix in ('.json', '.npy', '.runs.npy'):
+                try:
+                    os.remove(self._file(digest + suffix))
+                except OSError:
+                    pass
+            total -= size
+
+    def load(self, path: str) -> list[tuple[str, PackedSequence]]:
+        """
+        Returns the records of a FASTA file as (header, PackedSequence) pairs,
+        parsing the file only when no cache entry exists for its contents.
+
+        Sequences come back uppercase; other characters are preserved.
+        """
+        digest = self._digest_for(path)
+        records = self._read_entry(digest)
+        if records is not None:
+            return records
+
+        records = [(header, PackedSequence.from_str(seq.upper())) for header, seq in iter_fasta(path)]
+        try:
+            self._write_entry(digest, path, records)
+            self.evict(keep=digest)
+        except OSError:
+            pass  # Unwritable cache directory: still return the parsed records.
+        return records
+
+    def clear(self) -> None:
+        """Removes every cached entry and the path table."""
+        if not os.path.isdir(self.cache_dir):
+            return
+        for name in os.listdir(self.cache_dir):
+            if name.endswith(('.json', '.npy')):
+                os.remove(self._file(name))
+
+
+_default_cache = None
+
+
+def load_fasta_cached(path: str) -> list[tuple[str, PackedSequence]]:
+    """Loads a FASTA file through the shared default GenomeCache."""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = GenomeCache()
+    return _default_cache.load(path)
@@ -0,0 +1,243 @@
+import os
+from typing import Iterable, Union
+
+import numpy as np
+
+from seqtools.bgzf import GZIP_MAGIC
+from seqtools.codons import (DNA, INVALID_CODON, RNA, CodonTable, Sequence, codon_index_stream, codon_indices,
+                             encode_bases)
+from seqtools.fasta import find_record_starts, iter_fasta, iter_fasta_range
+
+FASTA_EXTENSIONS = ('.fasta', '.fa', '.fna', '.ffn', '.fas', '.fasta.gz', '.fa.gz', '.fna.gz')
+
+
+def codon_names(alphabet: str = RNA) -> list[str]:
+    """The 64 codons in index order (16 * b1 + 4 * b2 + b3)."""
+    return [a + b + c for a in alphabet for b in alphabet for c in alphabet]
+
+
+def codon_counts(sequence: Sequence, frame: int = 0, alphabet: str = DNA) -> np.ndarray:
+    """
+    Counts the codons of one reading frame with a single bincount.
+
+    Args:
+        sequence: The sequence; DNA by default, so no transcription is needed.
+        frame: Offset of the first codon.
+        alphabet: The four bases in code order.
+
+    Returns:
+        An int64 array of 64 counts in codon_names() order; codons with a
+        base outside the alphabet are not counted.
+    """
+    return np.bincount(codon_indices(sequence, frame, alphabet), minlength=INVALID_CODON + 1)[:INVALID_CODON]
+
+
+def frame_codon_counts(sequence: Sequence, alphabet: str = DNA) -> np.ndarray:
+    """
+    Codon counts of all three forward frames from one pass: the codon index
+    of every position is computed once and bincounted together with its
+    frame (position mod 3).
+
+    Returns:
+        A (3, 64) int64 array, row f = frame f.
+    """
+    indices = codon_index_stream(encode_bases(sequence, alphabet)).astype(np.int64)
+    frames = np.arange(len(indices)) % 3
+    slots = INVALID_CODON + 1
+    counts = np.bincount(frames * slots + indices, minlength=3 * slots).reshape(3, slots)
+    return counts[:, :INVALID_CODON]
+
+
+def amino_acid_matrix(table: CodonTable) -> tuple[np.ndarray, list[str]]:
+    """
+    The 64 x A codon -> amino acid aggregation matrix of a genetic code
+    (A = 21 for the standard code: 20 amino acids and the stop), so
+    counts @ matrix turns codon counts, or a stack of them, into amino acid
+    totals. Codons the table does not know belong to no column.
+
+    Returns:
+        (matrix, names): a 0/1 int64 matrix and the amino acid name of each column.
+    """
+    codon_amino_acids = table.names[:INVALID_CODON]
+    names = sorted(set(codon_amino_acids.tolist()) - {table.unknown})
+    column = {name: i for i, name in enumerate(names)}
+    matrix = np.zeros((INVALID_CODON, len(names)), dtype=np.int64)
+    for codon, name in enumerate(codon_amino_acids.tolist()):
+        if name in column:
+            matrix[codon, column[name]] = 1
+    return matrix, names
+
+
+def _count_records(records: Iterable[tuple[str, str]], frame: int, alphabet: str) -> tuple[list[str], np.ndarray]:
+    headers, rows = [], []
+    for header, sequence in records:
+        headers.append(header)
+        rows.append(codon_counts(sequence.upper(), frame, alphabet))
+    return headers, np.array(rows, dtype=np.int64).reshape(len(rows), INVALID_CODON)
+
+
+def _count_task(path: str, start: int, end: int, frame: int, alphabet: str) -> tuple[list[str], np.ndarray]:
+    """Worker: codon counts of the records in bytes [start, end) of a file (end None: the whole file)."""
+    records = iter_fasta(path) if end is None else iter_fasta_range(path, start, end)
+    return _count_records(records, frame, alphabet)
+
+
+def _fasta_paths(sources: Union[str, os.PathLike, Iterable[str]]) -> list[str]:
+    """Expands a directory (its FASTA files, sorted), a file, or a list of them into file paths."""
+    if isinstance(sources, (str, os.PathLike)):
+        sources = [sources]
+    paths = []
+    for source in sources:
+        if os.path.isdir(source):
+            paths.extend(sorted(os.path.join(source, name) for name in os.listdir(source)
+                                if name.lower().endswith(FASTA_EXTENSIONS)))
+        else:
+            paths.append(os.fspath(source))
+    return paths
+
+
+def codon_count_matrix(sources: Union[str, os.PathLike, Iterable[str]], frame: int = 0, alphabet: str = DNA,
+                       workers: int = None, chunk_bytes: int = 16 << 20) -> tuple[list[str], np.ndarray]:
+    """
+    Builds the genomes x 64 codon count matrix of many genomes in parallel.
+
+    Every FASTA record is one genome (row). Plain files are cut into byte
+    ranges of about `chunk_bytes` on record boundaries, so one large
+    multi-FASTA is spread over the workers as well as many small files;
+    compressed files are one task each. Rows come back in input order.
+
+    Args:
+        sources: A directory, a FASTA file, or a list of them.
+        frame: Reading frame counted in every record.
+        alphabet: The four bases in code order (records are uppercased).
+        workers: Worker processes (default: os.cpu_count(); 1 runs in-process).
+        chunk_bytes: Target size of one task of a plain file.
+
+    Returns:
+        (names, counts): the record headers and an int64 (genomes, 64)
+        matrix in codon_names() order.
+    """
+    workers = workers or os.cpu_count() or 1
+    tasks = []
+    for path in _fasta_paths(sources):
+        with open(path, 'rb') as f:
+            compressed = f.read(2) == GZIP_MAGIC
+        if compressed:
+            tasks.append((path, 0, None))
+            continue
+        bounds = find_record_starts(path, max(1, -(-os.path.getsize(path) // chunk_bytes)))
+        tasks.extend((path, start, end) for start, end in zip(bounds[:-1], bounds[1:]))
+
+    paths, starts, ends = zip(*tasks) if tasks else ((), (), ())
+    arguments = (paths, starts, ends, [frame] * len(tasks), [alphabet] * len(tasks))
+    if workers == 1 or len(tasks) <= 1:
+        results = list(map(_count_task, *arguments))
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_count_task, *arguments))
+
+    names = [header for headers, _ in results for header in headers]
+    counts = np.concatenate([rows for _, rows in results]) if results else np.empty((0, INVALID_CODON), dtype=np.int64)
+    return names, counts
+
+
+def _synonym_tables(table: CodonTable) -> tuple[np.ndarray, np.ndarray]:
+    """The aggregation matrix and, per codon, the number of codons of its amino acid (0: none)."""
+    matrix, _ = amino_acid_matrix(table)
+    return matrix, matrix @ matrix.sum(axis=0)
+
+
+def rscu(counts: np.ndarray, table: CodonTable = None) -> np.ndarray:
+    """
+    Relative synonymous codon usage: each codon's count divided by the mean
+    count of the synonymous codons of its amino acid (1 = no bias).
+
+    Args:
+        counts: Codon counts, (64,) or (genomes, 64).
+        table: The genetic code (default: standard).
+
+    Returns:
+        A float array of the same shape; NaN for codons whose amino acid
+        does not occur (or that the table does not know).
+    """
+    table = table or CodonTable(alphabet=DNA)
+    matrix, degeneracy = _synonym_tables(table)
+    counts = np.asarray(counts, dtype=np.float64)
+    synonym_totals = (counts @ matrix) @ matrix.T
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.where(synonym_totals > 0, counts * degeneracy / synonym_totals, np.nan)
+
+
+def relative_adaptiveness(reference_counts: np.ndarray, table: CodonTable = None,
+                          pseudocount: float = 0.5) -> np.ndarray:
+    """
+    CAI weights w: each codon's count in a reference set (e.g. highly
+    expressed genes) relative to its most used synonym.
+
+    Args:
+        reference_counts: (64,) counts, or (n, 64) that are summed.
+        table: The genetic code (default: standard).
+        pseudocount: Added to every count so unused codons get a finite log weight.
+
+    Returns:
+        A (64,) array of weights in (0, 1]; NaN for codons of no amino acid.
+    """
+    table = table or CodonTable(alphabet=DNA)
+    matrix, degeneracy = _synonym_tables(table)
+    reference = np.asarray(reference_counts, dtype=np.float64).reshape(-1, INVALID_CODON).sum(axis=0) + pseudocount
+    best_synonym = matrix @ np.where(matrix == 1, reference[:, None], 0).max(axis=0)
+    return np.where(degeneracy > 0, reference / np.where(best_synonym > 0, best_synonym, 1), np.nan)
+
+
+def cai(counts: np.ndarray, weights: np.ndarray, table: CodonTable = None) -> np.ndarray:
+    """
+    Codon adaptation index of each genome: the geometric mean of the
+    weights of its codons, as one matrix-vector product of the counts with
+    log(w). Stop codons and amino acids with a single codon (Met, Trp) are
+    left out, as in Sharp & Li (1987).
+
+    Args:
+        counts: Codon counts, (64,) or (genomes, 64).
+        weights: The relative_adaptiveness() weights.
+        table: The genetic code the weights were built with.
+
+    Returns:
+        CAI per genome (NaN for a genome without informative codons).
+    """
+    table = table or CodonTable(alphabet=DNA)
+    _, degeneracy = _synonym_tables(table)
+    informative = (degeneracy > 1) & ~table.is_stop[:INVALID_CODON] & np.isfinite(weights)
+    log_weights = np.where(informative, np.log(np.where(informative, weights, 1.0)), 0.0)
+    counts = np.asarray(counts, dtype=np.float64)
+    used = counts @ informative
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.exp(np.where(used > 0, (counts @ log_weights) / used, np.nan))
+
+
+def usage_distances(profiles: np.ndarray, metric: str = 'euclidean') -> np.ndarray:
+    """
+    Pairwise distances between codon-usage profiles (rows), computed from
+    the Gram matrix of the rows instead of a loop over pairs.
+
+    Args:
+        profiles: (genomes, 64), e.g. codon frequencies or rscu() values;
+            NaN entries count as 0.
+        metric: 'euclidean' or 'cosine' (1 - cosine similarity).
+
+    Returns:
+        A symmetric (genomes, genomes) float64 matrix with a zero diagonal.
+    """
+    if metric not in ('euclidean', 'cosine'):
+        raise ValueError("metric must be 'euclidean' or 'cosine'")
+    x = np.nan_to_num(np.asarray(profiles, dtype=np.float64))
+    gram = x @ x.T
+    norms = np.diag(gram).copy()
+    if metric == 'euclidean':
+        distances = np.sqrt(np.maximum(norms[:, None] + norms[None, :] - 2 * gram, 0.0))
+    else:
+        lengths = np.sqrt(norms)
+        lengths[lengths == 0] = 1.0
+        distances = np.clip(1.0 - gram / lengths[:, None] / lengths[None, :], 0.0, 2.0)
+    np.fill_diagonal(distances, 0.0)
+    return distances
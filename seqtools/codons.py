@@ -0,0 +1,161 @@
+from functools import lru_cache
+from typing import Optional, Union
+
+import numpy as np
+
+Sequence = Union[str, bytes, bytearray, memoryview]
+
+RNA = "ACGU"
+DNA = "ACGT"
+INVALID_CODON = 64  # index of codons containing a base outside the alphabet
+
+_ONE_TO_THREE = {
+    'A': 'Ala', 'R': 'Arg', 'N': 'Asn', 'D': 'Asp', 'C': 'Cys', 'Q': 'Gln', 'E': 'Glu',
+    'G': 'Gly', 'H': 'His', 'I': 'Ile', 'L': 'Leu', 'K': 'Lys', 'M': 'Met', 'F': 'Phe',
+    'P': 'Pro', 'S': 'Ser', 'T': 'Thr', 'W': 'Trp', 'Y': 'Tyr', 'V': 'Val', '*': 'STOP',
+}
+
+# The standard genetic code in the classic UCAG table order.
+STANDARD_CODE = {
+    a + b + c: _ONE_TO_THREE[aa]
+    for (a, b, c), aa in zip(((a, b, c) for a in "UCAG" for b in "UCAG" for c in "UCAG"),
+                             "FFLLSSSSYY**CC*WLLLLPPPPHHQQRRRRIIIMTTTTNNKKSSRRVVVVAAAADDEEGGGG")
+}
+
+
+@lru_cache(maxsize=None)
+def _base_table(alphabet: str) -> np.ndarray:
+    """Byte -> 2-bit base code lookup; bytes outside the alphabet map to 255."""
+    table = np.full(256, 255, dtype=np.uint8)
+    for code, base in enumerate(alphabet):
+        table[ord(base)] = code
+    return table
+
+
+def _as_bytes(sequence: Sequence) -> bytes:
+    if isinstance(sequence, str):
+        return sequence.encode('ascii', errors='replace')
+    return bytes(sequence)
+
+
+def encode_bases(sequence: Sequence, alphabet: str = RNA) -> np.ndarray:
+    """2-bit code (position in `alphabet`) of every base; 255 for other characters."""
+    return _base_table(alphabet)[np.frombuffer(_as_bytes(sequence), dtype=np.uint8)]
+
+
+def codon_index_stream(codes: np.ndarray) -> np.ndarray:
+    """
+    Codon index starting at every position of encoded bases (see
+    encode_bases), len - 2 entries; frame f is the stride-3 slice from f.
+    Codons with an invalid base get INVALID_CODON.
+    """
+    if len(codes) < 3:
+        return np.empty(0, dtype=np.uint8)
+    first, second, third = codes[:-2], codes[1:-1], codes[2:]
+    indices = (first << 4) | (second << 2) | third
+    indices[(first == 255) | (second == 255) | (third == 255)] = INVALID_CODON
+    return indices
+
+
+def codon_indices(sequence: Sequence, frame: int = 0, alphabet: str = RNA) -> np.ndarray:
+    """
+    Encodes the complete codons of one reading frame as indices 0-63.
+
+    Each base becomes a 2-bit code (its position in `alphabet`) and a codon
+    is 16 * b1 + 4 * b2 + b3, computed for all codons at once. A trailing
+    partial codon is dropped.
+
+    Args:
+        sequence: The sequence (str or bytes).
+        frame: Offset of the first codon (0, 1 or 2).
+        alphabet: The four bases in code order, RNA ("ACGU") or DNA ("ACGT").
+            Case matters, as in a dict lookup.
+
+    Returns:
+        A uint8 array with one index per codon; codons with a base outside
+        the alphabet get INVALID_CODON (64).
+    """
+    raw = np.frombuffer(_as_bytes(sequence), dtype=np.uint8)[frame:]
+    n = len(raw) // 3
+    codes = _base_table(alphabet)[raw[:3 * n]].reshape(n, 3)
+    indices = (codes[:, 0] << 4) | (codes[:, 1] << 2) | codes[:, 2]
+    indices[(codes == 255).any(axis=1)] = INVALID_CODON
+    return indices
+
+
+class CodonTable:
+    """
+    A genetic code as 65-entry NumPy lookup tables (64 codons plus the
+    invalid-codon slot), so a whole reading frame is translated with one
+    fancy-index instead of a dict lookup per codon.
+
+    Usage:
+        table = CodonTable(GENETIC_CODE)
+        table.translate("GGCAUGUACUAA")        # 'Met-Tyr'
+        table.translate_frame(rna, frame=1)    # no start-codon search
+        CodonTable(alphabet=DNA).translate(b"GGATGTTTTAA")  # 'Met-Phe'
+    """
+
+    def __init__(self, code: dict[str, str] = None, alphabet: str = RNA, stop: str = 'STOP',
+                 unknown: str = 'X', start: str = 'AUG'):
+        """
+        Args:
+            code: Codon -> amino acid name; codons missing from it translate
+                to `unknown`. Defaults to STANDARD_CODE.
+            alphabet: The four bases in code order. U and T in the codon keys
+                and in `start` are read as the alphabet's fourth base, so an
+                RNA table also works on DNA.
+            stop: The amino acid name that ends translation.
+            unknown: Name for codons that are not in the table.
+            start: The codon translation starts from.
+        """
+        code = STANDARD_CODE if code is None else code
+        to_alphabet = str.maketrans("UT", alphabet[3] * 2)
+        self.alphabet = alphabet
+        self.stop = stop
+        self.unknown = unknown
+        self.start = start.translate(to_alphabet)
+
+        names = [unknown] * (INVALID_CODON + 1)
+        for codon, amino_acid in code.items():
+            index = codon_indices(codon.translate(to_alphabet), alphabet=alphabet)
+            if len(index) == 1 and index[0] != INVALID_CODON:
+                names[index[0]] = amino_acid
+        self.names = np.array(names, dtype=object)
+        self.is_stop = self.names == stop
+
+    def indices(self, sequence: Sequence, frame: int = 0) -> np.ndarray:
+        """Codon indices of one reading frame (see codon_indices)."""
+        return codon_indices(sequence, frame, self.alphabet)
+
+    def translate_indices(self, indices: np.ndarray, sep: str = "-", to_stop: bool = True) -> str:
+        """
+        Translates codon indices, stopping before the first stop codon when
+        `to_stop` is set (otherwise stops are written out as their name).
+        """
+        if to_stop:
+            stops = np.flatnonzero(self.is_stop[indices])
+            if len(stops):
+                indices = indices[:stops[0]]
+        return sep.join(self.names[indices].tolist())
+
+    def translate_frame(self, sequence: Sequence, frame: int = 0, sep: str = "-", to_stop: bool = True) -> str:
+        """Translates a reading frame from its first base."""
+        return self.translate_indices(self.indices(sequence, frame), sep, to_stop)
+
+    def translate(self, sequence: Sequence, sep: str = "-") -> Optional[str]:
+        """
+        Translates from the first start codon to the first in-frame stop
+        codon (or the last complete codon).
+
+        Returns:
+            The amino acid names joined by `sep`, or None when the sequence
+            has no start codon.
+        """
+        if isinstance(sequence, str):
+            start_index = sequence.find(self.start)
+        else:
+            start_index = _as_bytes(sequence).find(self.start.encode('ascii'))
+        if start_index == -1:
+            return None
+        return self.translate_frame(sequence, start_index, sep)
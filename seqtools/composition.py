@@ -0,0 +1,82 @@
+from collections import Counter
+from typing import Union
+
+import numpy as np
+
+Chunk = Union[bytes, bytearray, memoryview, str, np.ndarray]
+
+
+class Composition:
+    """
+    Symbol counts of a sequence, computed with one np.bincount over the
+    uint8 view of each chunk instead of a Python loop per character.
+
+    Chunks can be added one at a time, so a streamed file is counted
+    without ever holding the whole sequence. Strings that are not ASCII
+    are counted with a Counter as a fallback.
+
+    Usage:
+        comp = Composition()
+        for _, seq in iter_fasta("genome.fasta"):
+            comp.update(seq)
+        comp.counts()          # {'A': ..., 'C': ..., ...}
+        comp.frequencies()     # {'A': 0.29..., ...}
+    """
+
+    def __init__(self, data: Chunk = None):
+        self._byte_counts = np.zeros(256, dtype=np.int64)
+        self._other = Counter()  # Non-ASCII symbols from str input
+        if data is not None:
+            self.update(data)
+
+    def update(self, chunk: Chunk) -> "Composition":
+        """
+        Adds the symbols of one chunk to the counts and returns self.
+
+        Raises:
+            TypeError: If `chunk` is a NumPy array whose dtype is not uint8.
+        """
+        if isinstance(chunk, str):
+            try:
+                chunk = chunk.encode('ascii')
+            except UnicodeEncodeError:
+                self._other.update(chunk)
+                return self
+        if not isinstance(chunk, np.ndarray):
+            chunk = np.frombuffer(chunk, dtype=np.uint8)
+        elif chunk.dtype != np.uint8:
+            raise TypeError(f"expected a uint8 array of byte values, got dtype {chunk.dtype}")
+        self._byte_counts += np.bincount(chunk.ravel(), minlength=256)
+        return self
+
+    def __add__(self, other: "Composition") -> "Composition":
+        result = Composition()
+        result._byte_counts = self._byte_counts + other._byte_counts
+        result._other = self._other + other._other
+        return result
+
+    @property
+    def total(self) -> int:
+        return int(self._byte_counts.sum()) + sum(self._other.values())
+
+    @property
+    def byte_counts(self) -> np.ndarray:
+        """The raw 256-entry count table, indexed by byte value."""
+        return self._byte_counts
+
+    def counts(self) -> dict[str, int]:
+        """Returns {symbol: count} for every symbol seen, sorted by symbol."""
+        result = Counter(self._other)
+        for byte in np.flatnonzero(self._byte_counts):
+            result[chr(byte)] += int(self._byte_counts[byte])
+        return dict(sorted(result.items()))
+
+    def frequencies(self) -> dict[str, float]:
+        """Returns {symbol: fraction of all symbols}, sorted by symbol."""
+        total = self.total
+        return {symbol: count / total for symbol, count in self.counts().items()} if total else {}
+
+
+def symbol_counts(data: Chunk) -> dict[str, int]:
+    """Counts every symbol of a sequence in one pass; see Composition."""
+    return Composition(data).counts()
@@ -0,0 +1,99 @@
+import numpy as np
+
+# Default plot width in pixels; signals are reduced to about two points per pixel.
+DEFAULT_WIDTH_PX = 2000
+
+
+def _bucket_extrema(values: np.ndarray, bucket: int) -> tuple[np.ndarray, np.ndarray]:
+    """Indices of the minimum and maximum of each run of `bucket` values (NaN ignored)."""
+    n = len(values)
+    n_full = n // bucket * bucket
+    low = np.where(np.isnan(values), np.inf, values)
+    high = np.where(np.isnan(values), -np.inf, values)
+
+    offsets = np.arange(0, n_full, bucket)
+    mins = offsets + low[:n_full].reshape(-1, bucket).argmin(axis=1)
+    maxs = offsets + high[:n_full].reshape(-1, bucket).argmax(axis=1)
+    if n_full < n:
+        mins = np.append(mins, n_full + low[n_full:].argmin())
+        maxs = np.append(maxs, n_full + high[n_full:].argmax())
+    return mins, maxs
+
+
+def minmax_downsample(x: np.ndarray, y: np.ndarray, width_px: int = DEFAULT_WIDTH_PX) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Reduces a signal to its minimum and maximum point in each of `width_px`
+    buckets (one per pixel column), kept in their original order, so every
+    peak and trough stays visible while at most 2 * width_px points are drawn.
+
+    Args:
+        x, y: The signal; x must be sorted.
+        width_px: Number of buckets, normally the plot width in pixels.
+
+    Returns:
+        (x, y) arrays of the kept points; the input itself when it is already small enough.
+    """
+    x = np.asarray(x)
+    y = np.asarray(y, dtype=np.float64)
+    if len(y) <= 2 * width_px:
+        return x, y
+    bucket = -(-len(y) // width_px)
+    mins, maxs = _bucket_extrema(y, bucket)
+    keep = np.unique(np.concatenate((mins, maxs, [0, len(y) - 1])))
+    return x[keep], y[keep]
+
+
+def lttb_downsample(x: np.ndarray, y: np.ndarray, n_out: int = DEFAULT_WIDTH_PX) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Largest-Triangle-Three-Buckets downsampling: keeps the first and last
+    points and, from each bucket in between, the point forming the largest
+    triangle with the previous kept point and the next bucket's average.
+    This keeps the visual shape of the curve with exactly n_out points.
+
+    Args:
+        x, y: The signal; x must be sorted.
+        n_out: Number of points to keep (at least 3).
+
+    Returns:
+        (x, y) arrays of the kept points; the input itself when it is already small enough.
+    """
+    x = np.asarray(x)
+    y = np.asarray(y, dtype=np.float64)
+    n = len(y)
+    if n <= n_out or n_out < 3:
+        return x, y
+
+    xf = x.astype(np.float64)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    keep = np.empty(n_out, dtype=np.int64)
+    keep[0], keep[-1] = 0, n - 1
+    previous = 0
+    for b in range(n_out - 2):
+        start, end = edges[b], edges[b + 1]
+        next_start, next_end = edges[b + 1], edges[b + 2] if b + 2 < len(edges) else n
+        avg_x = xf[next_start:next_end].mean()
+        avg_y = np.nanmean(y[next_start:next_end]) if np.isfinite(y[next_start:next_end]).any() else y[previous]
+        area = np.abs((xf[previous] - avg_x) * (y[start:end] - y[previous])
+                      - (xf[previous] - xf[start:end]) * (avg_y - y[previous]))
+        previous = start + (int(np.nanargmax(area)) if np.isfinite(area).any() else 0)
+        keep[b + 1] = previous
+    return x[keep], y[keep]
+
+
+def decimate(x: np.ndarray, y: np.ndarray, width_px: int = DEFAULT_WIDTH_PX,
+             method: str = 'minmax') -> tuple[np.ndarray, np.ndarray]:
+    """
+    Downsamples a signal for plotting so that the drawing cost depends on
+    the plot width, not on the signal length.
+
+    Args:
+        x, y: The signal.
+        width_px: Target plot width in pixels.
+        method: 'minmax' (exact extrema, up to 2 points per pixel) or 'lttb'
+            (shape-preserving, 2 points per pixel).
+    """
+    if method == 'minmax':
+        return minmax_downsample(x, y, width_px)
+    if method == 'lttb':
+        return lttb_downsample(x, y, 2 * width_px)
+    raise ValueError("method must be 'minmax' or 'lttb'")
@@ -0,0 +1,227 @@
+import gzip
+import mmap
+import os
+from typing import Iterator, NamedTuple
+
+from seqtools.bgzf import BgzfReader, is_bgzf, is_gzip
+
+
+class FaiEntry(NamedTuple):
+    """One line of a samtools-compatible .fai index."""
+    name: str
+    length: int
+    offset: int
+    linebases: int
+    linewidth: int
+
+
+def build_fasta_index(fasta_path: str) -> list[FaiEntry]:
+    """
+    Scans a FASTA file once and records, for every record, where its
+    sequence starts and how its lines are laid out. For gzip/BGZF input the
+    offsets refer to the uncompressed stream, as in samtools.
+
+    Args:
+        fasta_path: The path to the FASTA file.
+
+    Returns:
+        The index entries in file order.
+
+    Raises:
+        ValueError: If a record has lines of different widths (other than
+        its last line), since such records cannot be addressed by offset.
+    """
+    entries = []
+    name = None
+    offset = length = linebases = linewidth = 0
+    short_line_seen = False
+    pos = 0
+
+    def finish():
+        if name is not None:
+            entries.append(FaiEntry(name, length, offset, linebases, linewidth))
+
+    opener = gzip.open if is_gzip(fasta_path) else open
+    with opener(fasta_path, 'rb') as f:
+        for raw in f:
+            line_start = pos
+            pos += len(raw)
+            bases = raw.rstrip(b'\r\n')
+
+            if bases.startswith(b'>'):
+                finish()
+                name = bases[1:].split(maxsplit=1)[0].decode() if bases[1:].strip() else ""
+                offset = pos
+                length = linebases = linewidth = 0
+                short_line_seen = False
+                continue
+
+            if name is None or not bases:
+                # Sequence before the first header, or a blank line.
+                if name is not None and length:
+                    short_line_seen = True
+                continue
+
+            if short_line_seen:
+                raise ValueError(f"Record '{name}' has lines of different lengths "
+                                 f"(byte {line_start}); it cannot be indexed.")
+            if linebases == 0:
+                linebases = len(bases)
+                linewidth = len(raw)
+            elif len(bases) != linebases or len(raw) != linewidth:
+                if len(bases) > linebases:
+                    raise ValueError(f"Record '{name}' has lines of different lengths "
+                                     f"(byte {line_start}); it cannot be indexed.")
+                short_line_seen = True
+            length += len(bases)
+
+    finish()
+    return entries
+
+
+def write_fasta_index(entries: list[FaiEntry], fai_path: str) -> None:
+    """Writes index entries in the tab-separated .fai format."""
+    with open(fai_path, 'w') as f:
+        for e in entries:
+            f.write(f"{e.name}\t{e.length}\t{e.offset}\t{e.linebases}\t{e.linewidth}\n")
+
+
+def read_fasta_index(fai_path: str) -> list[FaiEntry]:
+    """Reads a .fai file written by write_fasta_index or samtools faidx."""
+    entries = []
+    with open(fai_path, 'r') as f:
+        for line in f:
+            fields = line.rstrip('\n').split('\t')
+            if len(fields) < 5:
+                continue
+            entries.append(FaiEntry(fields[0], *(int(x) for x in fields[1:5])))
+    return entries
+
+
+def load_fasta_index(fasta_path: str) -> list[FaiEntry]:
+    """
+    Returns the index of a FASTA file, reusing '<fasta>.fai' when it is newer
+    than the FASTA file and (re)building it otherwise.
+    """
+    fai_path = fasta_path + '.fai'
+    if os.path.exists(fai_path) and os.path.getmtime(fai_path) >= os.path.getmtime(fasta_path):
+        return read_fasta_index(fai_path)
+
+    entries = build_fasta_index(fasta_path)
+    try:
+        write_fasta_index(entries, fai_path)
+    except OSError:
+        pass  # Read-only location: keep the in-memory index.
+    return entries
+
+
+class IndexedFasta:
+    """
+    Random access to the records of an indexed FASTA file.
+
+    Plain files are memory-mapped, so fetch() only touches the pages that
+    hold the requested bases and the rest of the file is never read. BGZF
+    files (bgzip output) are read through their block table, inflating only
+    the blocks that overlap the request. Plain gzip cannot be seeked into
+    and is rejected.
+
+    Usage:
+        with IndexedFasta("genome.fa") as fa:
+            window = fa.fetch("chr1", 1_000_000, 1_000_500)
+    """
+
+    def __init__(self, fasta_path: str, entries: list[FaiEntry] = None):
+        if is_gzip(fasta_path) and not is_bgzf(fasta_path):
+            raise ValueError(f"{fasta_path} is plain gzip, which does not allow random access; "
+                             "recompress it with bgzip (or seqtools.bgzf.bgzip_file).")
+
+        self.path = fasta_path
+        self.entries = entries if entries is not None else load_fasta_index(fasta_path)
+        self._by_name = {e.name: e for e in self.entries}
+        self._bgzf = None
+        self._file = None
+        self._data = b""
+
+        if is_gzip(fasta_path):
+            self._bgzf = BgzfReader(fasta_path)
+        else:
+            self._file = open(fasta_path, 'rb')
+            if os.fstat(self._file.fileno()).st_size:
+                self._data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._by_name
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def close(self) -> None:
+        if isinstance(self._data, mmap.mmap):
+            self._data.close()
+        if self._file is not None:
+            self._file.close()
+        if self._bgzf is not None:
+            self._bgzf.close()
+
+    @property
+    def names(self) -> list[str]:
+        return [e.name for e in self.entries]
+
+    def length(self, name: str) -> int:
+        return self._entry(name).length
+
+    def _entry(self, name: str) -> FaiEntry:
+        try:
+            return self._by_name[name]
+        except KeyError:
+            raise KeyError(f"Record '{name}' is not in the index of {self.path}") from None
+
+    def _read_bytes(self, start: int, end: int) -> bytes:
+        if self._bgzf is not None:
+            return self._bgzf.read(start, end - start)
+        return self._data[start:end]
+
+    def fetch(self, name: str, start: int = 0, end: int = None) -> str:
+        """
+        Returns bases [start, end) of a record (0-based, end exclusive).
+
+        Coordinates are clamped to the record, like Python slicing of the
+        full sequence string would be for non-negative bounds.
+        """
+        entry = self._entry(name)
+        end = entry.length if end is None else min(end, entry.length)
+        start = max(0, start)
+        if start >= end:
+            return ""
+
+        def byte_pos(pos):
+            return entry.offset + (pos // entry.linebases) * entry.linewidth + pos % entry.linebases
+
+        raw = self._read_bytes(byte_pos(start), byte_pos(end - 1) + 1)
+        return raw.replace(b'\n', b'').replace(b'\r', b'').decode('ascii')
+
+    def iter_chunks(self, name: str, chunk_size: int, overlap: int = 0) -> Iterator[tuple[int, str]]:
+        """
+        Pages through a record in fixed-size chunks.
+
+        Consecutive chunks share `overlap` bases, so a sliding window of
+        length overlap + 1 sees every position exactly once across chunks.
+
+        Yields:
+            (start, chunk) tuples, where start is the 0-based chunk offset.
+        """
+        if chunk_size <= overlap:
+            raise ValueError("chunk_size must be larger than overlap")
+        length = self.length(name)
+        start = 0
+        while start < length:
+            yield start, self.fetch(name, start, start + chunk_size)
+            if start + chunk_size >= length:
+                break
+            start += chunk_size - overlap
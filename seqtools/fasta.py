@@ -0,0 +1,220 @@
+import gzip
+import io
+import os
+from typing import BinaryIO, Iterable, Iterator, TextIO, Union
+
+from seqtools.bgzf import GZIP_MAGIC
+
+PathOrHandle = Union[str, os.PathLike, TextIO]
+
+
+def open_fasta(source: Union[str, os.PathLike, BinaryIO]) -> TextIO:
+    """
+    Opens a FASTA file for reading as text, decompressing it on the fly when
+    it is gzip or BGZF compressed (detected from the magic bytes, not the
+    file extension).
+
+    Args:
+        source: A file path or a binary file object opened for reading.
+            Closing the returned handle also closes a passed file object.
+
+    Returns:
+        A text handle that yields the uncompressed lines.
+    """
+    if hasattr(source, 'read'):
+        magic = source.peek(2)[:2] if hasattr(source, 'peek') else b""
+        if magic == GZIP_MAGIC:
+            return io.TextIOWrapper(gzip.GzipFile(fileobj=source))
+        return io.TextIOWrapper(source)
+
+    with open(source, 'rb') as f:
+        magic = f.read(2)
+    if magic == GZIP_MAGIC:
+        return gzip.open(source, 'rt')
+    return open(source, 'r')
+
+
+def parse_fasta_lines(lines: Iterable[str]) -> Iterator[tuple[str, str]]:
+    """
+    Groups FASTA text lines into records.
+
+    Lines are stripped and blank lines are skipped. The sequence lines of a
+    record are collected in a list and joined once when the record ends, so
+    the cost is linear in the record size and only one record is held at a time.
+    Sequence lines that appear before the first header are yielded as a
+    record with an empty header.
+
+    Args:
+        lines: Any iterable of text lines (an open file, str.splitlines(), ...).
+
+    Yields:
+        (header, sequence) tuples; the header is the line without the '>'.
+    """
+    header = None
+    chunks = []
+
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+
+        if line.startswith('>'):
+            if header is not None or chunks:
+                yield header or "", "".join(chunks)
+            header = line[1:]
+            chunks = []
+        else:
+            chunks.append(line)
+
+    if header is not None or chunks:
+        yield header or "", "".join(chunks)
+
+
+def iter_fasta(source: PathOrHandle) -> Iterator[tuple[str, str]]:
+    """
+    Streams the records of a (multi-)FASTA file one at a time.
+
+    Args:
+        source: A file path (plain, gzip or BGZF) or an already opened text handle.
+
+    Yields:
+        (header, sequence) tuples in file order. Memory use is bounded by
+        the largest record, not by the file size.
+    """
+    if hasattr(source, 'read'):
+        yield from parse_fasta_lines(source)
+        return
+
+    with open_fasta(source) as f:
+        yield from parse_fasta_lines(f)
+
+
+def iter_fasta_blocks(source: PathOrHandle, block_size: int = 1 << 20) -> Iterator[tuple[str, str, bool]]:
+    """
+    Streams the sequence of a (multi-)FASTA file in blocks of about
+    `block_size` characters, so even a single huge record is never held
+    in memory at once.
+
+    Args:
+        source: A file path (plain, gzip or BGZF) or an already opened text handle.
+        block_size: Number of sequence characters after which a block is emitted.
+
+    Yields:
+        (header, block, first) tuples; `first` is True for the first block of
+        each record, and the blocks of a record concatenate to its sequence.
+    """
+    if not hasattr(source, 'read'):
+        with open_fasta(source) as f:
+            yield from iter_fasta_blocks(f, block_size)
+        return
+
+    header = None
+    chunks = []
+    size = 0
+    first = True
+
+    for line in source:
+        line = line.strip()
+        if not line:
+            continue
+
+        if line.startswith('>'):
+            if header is not None or chunks:
+                yield header or "", "".join(chunks), first
+            header = line[1:]
+            chunks = []
+            size = 0
+            first = True
+        else:
+            chunks.append(line)
+            size += len(line)
+            if size >= block_size:
+                yield header or "", "".join(chunks), first
+                chunks = []
+                size = 0
+                first = False
+
+    if header is not None or chunks:
+        yield header or "", "".join(chunks), first
+
+
+def find_record_starts(path: str, n_ranges: int) -> list[int]:
+    """
+    Splits a plain FASTA file into about n_ranges byte ranges whose
+    boundaries sit on the start of a header line.
+
+    Returns:
+        The sorted boundaries, from 0 to the file size; range i is
+        [bounds[i], bounds[i + 1]) and can be read with iter_fasta_range().
+    """
+    size = os.path.getsize(path)
+    starts = [0]
+    with open(path, 'rb') as f:
+        for i in range(1, n_ranges):
+            target = i * size // n_ranges
+            if target <= starts[-1]:
+                continue
+            pos = target - 1
+            f.seek(pos)
+            # Scan forward to the next line that begins with '>'.
+            while True:
+                block = f.read(1 << 16)
+                if len(block) < 2:
+                    boundary = size
+                    break
+                hits = [h for h in (block.find(b'\n>'), block.find(b'\r>')) if h != -1]
+                if hits:
+                    boundary = pos + min(hits) + 1
+                    break
+                pos += len(block) - 1
+                f.seek(pos)
+            if boundary >= size:
+                break
+            starts.append(boundary)
+    return starts + [size]
+
+
+def iter_fasta_range(path: str, start: int, end: int) -> Iterator[tuple[str, str]]:
+    """Parses the records in bytes [start, end) of a plain FASTA file (see find_record_starts)."""
+    with open(path, 'rb') as f:
+        f.seek(start)
+        data = f.read(end - start)
+    yield from parse_fasta_lines(io.TextIOWrapper(io.BytesIO(data)))
+
+
+def _parse_byte_range(path: str, start: int, end: int) -> list[tuple[str, str]]:
+    """Worker: the records of one byte range as a list."""
+    return list(iter_fasta_range(path, start, end))
+
+
+def iter_fasta_parallel(path: str, workers: int = None, chunk_bytes: int = 64 << 20) -> Iterator[tuple[str, str]]:
+    """
+    Parses a large multi-FASTA file in parallel byte ranges.
+
+    The file is cut into ranges of about `chunk_bytes`, each range is moved
+    forward to the next header line, and the ranges are parsed in a process
+    pool. Records are yielded in their original order and are identical to
+    those from iter_fasta(). Compressed or small files (a single range) are
+    parsed serially.
+
+    Args:
+        path: Path to a FASTA file.
+        workers: Number of worker processes (default: os.cpu_count()).
+        chunk_bytes: Target size of one byte range.
+    """
+    from concurrent.futures import ProcessPoolExecutor
+
+    workers = workers or os.cpu_count() or 1
+    with open(path, 'rb') as f:
+        compressed = f.read(2) == GZIP_MAGIC
+    size = os.path.getsize(path)
+    n_ranges = max(workers, -(-size // chunk_bytes))
+
+    if compressed or workers == 1 or size <= chunk_bytes:
+        yield from iter_fasta(path)
+        return
+
+    bounds = find_record_starts(path, n_ranges)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for records in pool.map(_parse_byte_range, [path] * (len(bounds) - 1), bounds[:-1], bounds[1:]):
+            yield from records
@@ -0,0 +1,147 @@
+from typing import Iterable, Iterator, NamedTuple, TextIO, Union
+
+import numpy as np
+
+
+class Interval(NamedTuple):
+    start: int   # first position at or above the threshold
+    end: int     # one past the last position (half-open, like BED)
+    peak: float  # highest value inside the interval
+
+
+def _runs(values: np.ndarray, threshold: float, merge_gap: int) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Finds the runs of values >= threshold with one vectorized pass, merges
+    runs separated by at most `merge_gap` positions, and returns their
+    (starts, ends, peaks). NaN never reaches the threshold.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    above = values >= threshold
+    edges = np.diff(np.concatenate(([False], above, [False])).astype(np.int8))
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1)
+    if len(starts) > 1 and merge_gap > 0:
+        keep = np.concatenate(([True], starts[1:] - ends[:-1] > merge_gap))
+        starts = starts[keep]
+        ends = ends[np.concatenate((keep[1:], [True]))]
+    if len(starts) == 0:
+        return starts, ends, np.empty(0)
+    # fmax ignores the NaN that may sit in a merged gap.
+    bounds = np.stack((starts, ends), axis=1).ravel()
+    peaks = np.fmax.reduceat(np.append(values, -np.inf), bounds)[::2]
+    return starts, ends, peaks
+
+
+class IntervalStream:
+    """
+    Extracts above-threshold intervals from a signal that arrives in chunks,
+    e.g. the Tm profile of a chromosome computed piece by piece, without
+    keeping the whole signal.
+
+    Each chunk is scanned with vectorized run detection; only the last run,
+    which may continue in the next chunk, is carried over. The intervals are
+    identical to threshold_intervals() on the concatenated signal.
+
+    Usage:
+        stream = IntervalStream(threshold=60, min_length=20, merge_gap=5)
+        for chunk in iter_tm(sequence, 20):
+            for interval in stream.feed(chunk):
+                ...
+        intervals_left = stream.close()
+    """
+
+    def __init__(self, threshold: float, min_length: int = 1, merge_gap: int = 0):
+        self.threshold = threshold
+        self.min_length = min_length
+        self.merge_gap = merge_gap
+        self.position = 0
+        self._carry = None  # [start, end, peak] of the run that may continue
+
+    def _keep(self, start: int, end: int) -> bool:
+        return end - start >= self.min_length
+
+    def feed(self, chunk: np.ndarray) -> list[Interval]:
+        """Scans the next chunk and returns the intervals that are now complete."""
+        starts, ends, peaks = _runs(chunk, self.threshold, self.merge_gap)
+        starts = starts + self.position
+        ends = ends + self.position
+        self.position += len(chunk)
+        if len(starts) == 0:
+            return []
+
+        done = []
+        first = 0
+        if self._carry is not None:
+            if starts[0] - self._carry[1] <= self.merge_gap:
+                self._carry = [self._carry[0], int(ends[0]), max(self._carry[2], float(peaks[0]))]
+                first = 1
+            if first == len(starts):
+                return done
+            if self._keep(self._carry[0], self._carry[1]):
+                done.append(Interval(*self._carry))
+
+        middle = slice(first, len(starts) - 1)
+        long_enough = ends[middle] - starts[middle] >= self.min_length
+        done.extend(Interval(int(s), int(e), float(p)) for s, e, p in
+                    zip(starts[middle][long_enough], ends[middle][long_enough], peaks[middle][long_enough]))
+        self._carry = [int(starts[-1]), int(ends[-1]), float(peaks[-1])]
+        return done
+
+    def close(self) -> list[Interval]:
+        """Returns the last pending interval, if any."""
+        carry, self._carry = self._carry, None
+        return [Interval(*carry)] if carry is not None and self._keep(carry[0], carry[1]) else []
+
+
+def threshold_intervals(values: np.ndarray, threshold: float, min_length: int = 1,
+                        merge_gap: int = 0) -> list[Interval]:
+    """
+    Returns the intervals where values >= threshold.
+
+    Args:
+        values: The signal, e.g. a Tm profile indexed by window start.
+        threshold: Minimum value of a position inside an interval.
+        min_length: Intervals shorter than this (after merging) are dropped.
+        merge_gap: Intervals separated by at most this many positions
+            below the threshold are merged into one.
+
+    Returns:
+        Interval(start, end, peak) tuples, half-open, in order.
+    """
+    stream = IntervalStream(threshold, min_length, merge_gap)
+    return stream.feed(values) + stream.close()
+
+
+def iter_threshold_intervals(chunks: Iterable[np.ndarray], threshold: float, min_length: int = 1,
+                             merge_gap: int = 0) -> Iterator[Interval]:
+    """Streams the intervals of a signal given as consecutive chunks (see IntervalStream)."""
+    stream = IntervalStream(threshold, min_length, merge_gap)
+    for chunk in chunks:
+        yield from stream.feed(chunk)
+    yield from stream.close()
+
+
+def write_bed(intervals: Iterable[Interval], out: Union[str, TextIO], chrom: str,
+              window_size: int = 1, name: str = "tm") -> None:
+    """
+    Writes intervals as BED: chrom, start, end, name, score.
+
+    Args:
+        intervals: Intervals over window starts.
+        out: A path or an open text handle.
+        chrom: The chromosome / sequence name for column 1.
+        window_size: Length of the windows behind the signal; the end is
+            extended by window_size - 1 so the BED region covers every base
+            of the last window.
+        name: Prefix of the name column, which also records the peak value.
+            The score column is the peak x 10, clipped to BED's 0-1000.
+    """
+    if isinstance(out, str):
+        with open(out, 'w') as handle:
+            write_bed(intervals, handle, chrom, window_size, name)
+        return
+
+    for interval in intervals:
+        score = int(min(1000, max(0, round(interval.peak * 10))))
+        out.write(f"{chrom}\t{interval.start}\t{interval.end + window_size - 1}\t"
+                  f"{name}_peak={interval.peak:.2f}\t{score}\n")
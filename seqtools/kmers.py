@@ -0,0 +1,594 @@
+import os
+import tempfile
+from itertools import product
+from typing import Iterable, Iterator, Union
+
+import numpy as np
+
+from seqtools.fasta import iter_fasta_blocks
+from seqtools.packed import PackedSequence
+
+DNA = "ACGT"
+INVALID = 255
+
+# Watson-Crick and IUPAC complements, used to build an alphabet's complement codes.
+COMPLEMENT = dict(zip("ACGTURYSWKMBDHVN", "TGCAAYRSWMKVHDBN"))
+
+# Alphabet size ** k above which counts are kept sparse (sorted unique codes)
+# instead of in a dense array with one slot per possible k-mer.
+DENSE_LIMIT = 1 << 22
+
+Sequence = Union[str, bytes, bytearray, memoryview, PackedSequence]
+# Types taken as one sequence; anything else is treated as an iterable of sequences.
+SEQUENCE_TYPES = (str, bytes, bytearray, memoryview, PackedSequence)
+
+
+def _lookup_table(alphabet: str) -> np.ndarray:
+    """Byte -> symbol index for ASCII symbols, case-insensitive; INVALID elsewhere."""
+    table = np.full(256, INVALID, dtype=np.uint8)
+    for code, symbol in enumerate(alphabet):
+        if ord(symbol) < 128:
+            table[ord(symbol.upper())] = code
+            table[ord(symbol.lower())] = code
+    return table
+
+
+def encode(sequence: Sequence, alphabet: str = DNA) -> np.ndarray:
+    """
+    Maps a sequence to one uint8 symbol index per character.
+
+    Characters outside the alphabet (case-insensitive) become INVALID, so
+    k-mers that span them are not counted.
+
+    Args:
+        sequence: The text to encode (str, bytes-like or PackedSequence).
+        alphabet: The symbols, in the order that defines their codes.
+
+    Returns:
+        A uint8 array with the same length as `sequence`.
+    """
+    if len(alphabet) > INVALID:
+        raise ValueError(f"alphabets are limited to {INVALID} symbols")
+    if isinstance(sequence, PackedSequence):
+        sequence = sequence.to_bytes()
+    if isinstance(sequence, str):
+        try:
+            sequence = sequence.encode('ascii')
+        except UnicodeEncodeError:
+            # Non-ASCII text: compare code points against the sorted alphabet.
+            points = np.frombuffer(sequence.upper().encode('utf-32-le'), dtype=np.uint32)
+            symbols = np.array([ord(s.upper()) for s in alphabet], dtype=np.uint32)
+            order = np.argsort(symbols)
+            idx = np.searchsorted(symbols[order], points).clip(0, len(symbols) - 1)
+            found = symbols[order][idx] == points
+            return np.where(found, order[idx], INVALID).astype(np.uint8)
+    return _lookup_table(alphabet)[np.frombuffer(sequence, dtype=np.uint8)]
+
+
+def window_codes(codes: np.ndarray, k: int, sigma: int) -> np.ndarray:
+    """
+    Returns the base-sigma integer code of every length-k window of `codes`,
+    first symbol most significant (so codes sort like itertools.product).
+
+    Windows are combined by doubling, W[a+b][i] = W[a][i] * sigma**b + W[b][i+a],
+    which takes O(log k) vectorized passes instead of k.
+    """
+    codes = codes.astype(np.int64)
+    n = len(codes)
+    if n < k:
+        return np.empty(0, dtype=np.int64)
+
+    result, result_len = None, 0
+    block, block_len = codes, 1
+    remaining = k
+    while remaining:
+        if remaining & 1:
+            if result is None:
+                result, result_len = block, block_len
+            else:
+                m = n - (result_len + block_len) + 1
+                result = result[:m] * sigma ** block_len + block[result_len:result_len + m]
+                result_len += block_len
+        remaining >>= 1
+        if remaining:
+            m = n - 2 * block_len + 1
+            block = block[:m] * sigma ** block_len + block[block_len:block_len + m]
+            block_len *= 2
+    return result
+
+
+def complement_codes(alphabet: str) -> np.ndarray:
+    """
+    Returns, for each symbol index of the alphabet, the index of its
+    complement (A<->T or A<->U, C<->G, IUPAC codes likewise).
+
+    Raises:
+        ValueError: If a symbol's complement is not in the alphabet.
+    """
+    upper = alphabet.upper()
+    table = np.empty(len(alphabet), dtype=np.int64)
+    for code, symbol in enumerate(upper):
+        complement = COMPLEMENT.get(symbol)
+        if complement == 'T' and 'T' not in upper and 'U' in upper:
+            complement = 'U'
+        if complement is None or complement not in upper:
+            raise ValueError(f"alphabet '{alphabet}' has no complement for '{symbol}'")
+        table[code] = upper.index(complement)
+    return table
+
+
+def reverse_complement_window_codes(codes: np.ndarray, comp: np.ndarray, k: int, sigma: int) -> np.ndarray:
+    """
+    Returns the code of the reverse complement of every length-k window,
+    aligned with window_codes(codes, k, sigma).
+
+    The reverse complement puts the complement of the last symbol first, so
+    the doubling step mirrors the forward one:
+    RC[a+b][i] = RC[a][i] + sigma**a * RC[b][i+a].
+    """
+    codes = comp[codes]
+    n = len(codes)
+    if n < k:
+        return np.empty(0, dtype=np.int64)
+
+    result, result_len = None, 0
+    block, block_len = codes, 1
+    remaining = k
+    while remaining:
+        if remaining & 1:
+            if result is None:
+                result, result_len = block, block_len
+            else:
+                m = n - (result_len + block_len) + 1
+                result = result[:m] + sigma ** result_len * block[result_len:result_len + m]
+                result_len += block_len
+        remaining >>= 1
+        if remaining:
+            m = n - 2 * block_len + 1
+            block = block[:m] + sigma ** block_len * block[block_len:block_len + m]
+            block_len *= 2
+    return result
+
+
+def valid_windows(codes: np.ndarray, k: int) -> np.ndarray:
+    """Returns a boolean mask of the length-k windows that contain no INVALID symbol."""
+    bad = np.concatenate(([0], np.cumsum(codes == INVALID)))
+    return bad[k:] == bad[:-k] if len(codes) >= k else np.empty(0, dtype=bool)
+
+
+def encoded_kmer_codes(codes: np.ndarray, k: int, alphabet: str = DNA, canonical: bool = False) -> np.ndarray:
+    """
+    Returns the codes of the k-mers of an encoded sequence that contain
+    only alphabet symbols, in order.
+
+    With canonical=True each k-mer is replaced by the smaller of its own
+    code and its reverse complement's; both codes are computed together
+    from the same encoded array, without building any reverse-complement string.
+    """
+    sigma = len(alphabet)
+    clean = np.where(codes == INVALID, 0, codes)
+    windows = window_codes(clean, k, sigma)
+    if canonical:
+        windows = np.minimum(windows, reverse_complement_window_codes(clean, complement_codes(alphabet), k, sigma))
+    return windows[valid_windows(codes, k)]
+
+
+def kmer_codes(sequence: Sequence, k: int, alphabet: str = DNA, canonical: bool = False) -> np.ndarray:
+    """Returns the codes of the k-mers of a sequence that contain only alphabet symbols, in order."""
+    return encoded_kmer_codes(encode(sequence, alphabet), k, alphabet, canonical)
+
+
+def iter_file_kmer_codes(source, k: int, alphabet: str = DNA, block_size: int = 1 << 24,
+                         canonical: bool = False) -> Iterator[np.ndarray]:
+    """
+    Streams the k-mer codes of a FASTA file block by block (see
+    fasta.iter_fasta_blocks). Each block is prefixed with the last k-1 bases
+    of the previous block of the same record, so every k-mer is produced
+    exactly once and none spans two records.
+    """
+    carry = ""
+    for _, block, first in iter_fasta_blocks(source, block_size):
+        text = block if first else carry + block
+        carry = text[-(k - 1):] if k > 1 else ""
+        yield kmer_codes(text, k, alphabet, canonical)
+
+
+def _merge_sorted(codes: list[np.ndarray], counts: list[np.ndarray]) -> tuple[np.ndarray, np.ndarray]:
+    """Merges (codes, counts) tables, summing the counts of equal codes."""
+    codes = np.concatenate(codes) if codes else np.empty(0, dtype=np.int64)
+    counts = np.concatenate(counts) if counts else np.empty(0, dtype=np.int64)
+    if len(codes) == 0:
+        return codes.astype(np.int64), counts.astype(np.int64)
+    order = np.argsort(codes, kind='stable')
+    codes, counts = codes[order], counts[order]
+    starts = np.flatnonzero(np.concatenate(([True], codes[1:] != codes[:-1])))
+    return codes[starts], np.add.reduceat(counts, starts)
+
+
+class KmerCounts:
+    """
+    Counts of the k-mers of one or more sequences over a fixed alphabet.
+
+    Each k-mer is identified by its base-sigma code (first symbol most
+    significant), and the table is stored sparsely as sorted unique codes
+    with their counts, so it only grows with the k-mers actually present.
+    Tables with the same alphabet and k can be added together. A canonical
+    table counts each k-mer together with its reverse complement, under the
+    smaller of the two codes.
+
+    Usage:
+        counts = count_kmers(genome, 3)
+        counts["ATG"]
+        for kmer, count in zip(generate_combinations("ACGT", 3), counts.dense()):
+            ...
+    """
+
+    def __init__(self, alphabet: str, k: int, codes: np.ndarray = None, counts: np.ndarray = None,
+                 canonical: bool = False):
+        self.alphabet = alphabet
+        self.k = k
+        self.canonical = canonical
+        self.codes = codes if codes is not None else np.empty(0, dtype=np.int64)
+        self.counts = counts if counts is not None else np.empty(0, dtype=np.int64)
+
+    @property
+    def sigma(self) -> int:
+        return len(self.alphabet)
+
+    @property
+    def total(self) -> int:
+        """Number of counted windows."""
+        return int(self.counts.sum())
+
+    def __len__(self) -> int:
+        """Number of distinct k-mers seen."""
+        return len(self.codes)
+
+    def __repr__(self) -> str:
+        return (f"KmerCounts(alphabet='{self.alphabet}', k={self.k}, canonical={self.canonical}, "
+                f"distinct={len(self)}, total={self.total})")
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, KmerCounts):
+            return NotImplemented
+        return (self.alphabet == other.alphabet and self.k == other.k and self.canonical == other.canonical
+                and np.array_equal(self.codes, other.codes) and np.array_equal(self.counts, other.counts))
+
+    def __add__(self, other: "KmerCounts") -> "KmerCounts":
+        if (self.alphabet, self.k, self.canonical) != (other.alphabet, other.k, other.canonical):
+            raise ValueError("can only add k-mer counts with the same alphabet, k and canonical mode")
+        codes, counts = _merge_sorted([self.codes, other.codes], [self.counts, other.counts])
+        return KmerCounts(self.alphabet, self.k, codes, counts, self.canonical)
+
+    def code_of(self, kmer: str) -> int:
+        """Returns the code a k-mer is counted under (its canonical code in a canonical table)."""
+        codes = kmer_codes(kmer, self.k, self.alphabet, self.canonical)
+        if len(kmer) != self.k or len(codes) != 1:
+            raise KeyError(kmer)
+        return int(codes[0])
+
+    def decode(self, code: int) -> str:
+        symbols = []
+        for _ in range(self.k):
+            code, digit = divmod(int(code), self.sigma)
+            symbols.append(self.alphabet[digit])
+        return "".join(reversed(symbols))
+
+    def __getitem__(self, kmer: str) -> int:
+        code = self.code_of(kmer)
+        i = np.searchsorted(self.codes, code)
+        return int(self.counts[i]) if i < len(self.codes) and self.codes[i] == code else 0
+
+    def items(self) -> Iterator[tuple[str, int]]:
+        """Yields (kmer, count) for the k-mers present, in code order."""
+        for code, count in zip(self.codes, self.counts):
+            yield self.decode(code), int(count)
+
+    def to_dict(self) -> dict[str, int]:
+        return dict(self.items())
+
+    def dense(self) -> np.ndarray:
+        """
+        Returns one count per possible k-mer, in the order of
+        itertools.product(alphabet, repeat=k).
+        """
+        size = self.sigma ** self.k
+        if size > 1 << 31:
+            raise MemoryError(f"a dense table of {size} k-mers is too large")
+        table = np.zeros(size, dtype=np.int64)
+        table[self.codes] = self.counts
+        return table
+
+    def percentage_table(self, total: int = None) -> list[tuple[str, float, int]]:
+        """
+        Returns (kmer, percentage, count) for every possible k-mer in
+        product order, as printed by the PROJECT_L2 tools.
+
+        Args:
+            total: The denominator of the percentages (default: the number
+                of counted windows).
+        """
+        total = self.total if total is None else total
+        kmers = ("".join(p) for p in product(self.alphabet, repeat=self.k))
+        return [(kmer, (100.0 * count / total) if total > 0 else 0.0, int(count))
+                for kmer, count in zip(kmers, self.dense())]
+
+
+def count_kmers(sequence: Union[Sequence, Iterable[Sequence]], k: int, alphabet: str = DNA,
+                canonical: bool = False) -> KmerCounts:
+    """
+    Counts every k-mer of a sequence in one pass.
+
+    The sequence is encoded once, the window codes of all positions are
+    built with a few vectorized passes, and they are counted with
+    np.bincount into a dense table when alphabet**k <= DENSE_LIMIT, or
+    with np.unique (sort-based) otherwise. All records share that one
+    table (or one final merge). Windows that contain a symbol outside the
+    alphabet are skipped.
+
+    Args:
+        sequence: One sequence, or an iterable of sequences (e.g. FASTA
+            records) whose counts are summed; k-mers never span two sequences.
+        k: The k-mer length (alphabet**k must fit in 63 bits).
+        alphabet: The symbols, case-insensitive; their order defines the k-mer order.
+        canonical: Count each k-mer together with its reverse complement
+            (strand-agnostic counting; the alphabet must be closed under
+            complement). The default counts the forward strand only.
+
+    Returns:
+        A KmerCounts table.
+    """
+    sigma = len(alphabet)
+    if k < 1:
+        raise ValueError("k must be at least 1")
+    if sigma ** k >= 1 << 63:
+        raise ValueError(f"{sigma}**{k} k-mers do not fit in 64-bit codes")
+
+    if isinstance(sequence, SEQUENCE_TYPES):
+        sequence = [sequence]
+
+    size = sigma ** k
+    if size > DENSE_LIMIT:
+        parts = [np.unique(kmer_codes(seq, k, alphabet, canonical), return_counts=True) for seq in sequence]
+        if len(parts) == 1:
+            codes, counts = parts[0]
+        else:
+            codes, counts = _merge_sorted([unique for unique, _ in parts], [c for _, c in parts])
+        return KmerCounts(alphabet, k, codes, counts.astype(np.int64), canonical)
+
+    # One table for all records. Short records are batched so each
+    # bincount pass covers at least `size` windows.
+    dense = np.zeros(size, dtype=np.int64)
+    pending, pending_len = [], 0
+    for seq in sequence:
+        windows = kmer_codes(seq, k, alphabet, canonical)
+        pending.append(windows)
+        pending_len += len(windows)
+        if pending_len >= size:
+            dense += np.bincount(np.concatenate(pending), minlength=size)
+            pending, pending_len = [], 0
+    if pending_len:
+        dense += np.bincount(np.concatenate(pending), minlength=size)
+    present = np.flatnonzero(dense)
+    return KmerCounts(alphabet, k, present.astype(np.int64), dense[present], canonical)
+
+
+def _save_run(directory: str, index: int, codes: np.ndarray, counts: np.ndarray) -> tuple[str, str]:
+    paths = (os.path.join(directory, f"run{index}.codes.npy"), os.path.join(directory, f"run{index}.counts.npy"))
+    np.save(paths[0], codes)
+    np.save(paths[1], counts)
+    return paths
+
+
+def _merge_runs(runs: list[tuple[str, str]], memory_limit: int) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Merges sorted on-disk runs in rounds: each round takes, from every
+    memory-mapped run, the codes up to a common bound, so only about
+    `memory_limit` bytes of the runs are in memory at a time.
+    """
+    arrays = [(np.load(c, mmap_mode='r'), np.load(n, mmap_mode='r')) for c, n in runs]
+    cursors = [0] * len(arrays)
+    step = max(1, memory_limit // (16 * (len(arrays) + 1)))
+    out_codes, out_counts = [], []
+
+    while True:
+        live = [i for i, (codes, _) in enumerate(arrays) if cursors[i] < len(codes)]
+        if not live:
+            break
+        # Everything <= bound can be merged now: no run has an unread code below it.
+        bound = min(arrays[i][0][min(cursors[i] + step, len(arrays[i][0])) - 1] for i in live)
+        part_codes, part_counts = [], []
+        for i in live:
+            codes, counts = arrays[i]
+            end = int(np.searchsorted(codes[cursors[i]:], bound, side='right')) + cursors[i]
+            part_codes.append(np.asarray(codes[cursors[i]:end]))
+            part_counts.append(np.asarray(counts[cursors[i]:end]))
+            cursors[i] = end
+        codes, counts = _merge_sorted(part_codes, part_counts)
+        out_codes.append(codes)
+        out_counts.append(counts)
+
+    # Rounds cover disjoint, increasing code ranges, so they just concatenate.
+    del arrays
+    return _merge_sorted([], []) if not out_codes else (np.concatenate(out_codes), np.concatenate(out_counts))
+
+
+def count_kmers_file(source, k: int, alphabet: str = DNA, block_size: int = 1 << 24,
+                     memory_limit: int = 256 << 20, tmp_dir: str = None, canonical: bool = False) -> KmerCounts:
+    """
+    Counts the k-mers of a FASTA file without loading it into memory.
+
+    The file is streamed in blocks of `block_size` bases; each block is
+    counted together with the last k-1 bases of the previous block of the
+    same record, so no k-mer is lost or counted twice at a block boundary.
+    Small alphabets**k are summed in one dense table. Otherwise the partial
+    tables are merged, and once they take more than `memory_limit` bytes the
+    merged, sorted table is spilled to a temporary file; the spilled runs are
+    merged back at the end. The result is identical to
+    count_kmers(seq for _, seq in iter_fasta(source), k, alphabet, canonical).
+
+    Args:
+        source: A FASTA path (plain, gzip or BGZF) or an open text handle.
+        k: The k-mer length.
+        alphabet: The symbols, case-insensitive.
+        block_size: Bases read per block.
+        memory_limit: Approximate ceiling, in bytes, for the partial count tables.
+        tmp_dir: Where spilled runs are written (default: the system temp directory).
+        canonical: Count k-mers and their reverse complements together.
+
+    Returns:
+        A KmerCounts table.
+    """
+    sigma = len(alphabet)
+    dense = np.zeros(sigma ** k, dtype=np.int64) if sigma ** k <= DENSE_LIMIT else None
+    parts = []
+    part_bytes = 0
+    runs = []
+
+    with tempfile.TemporaryDirectory(dir=tmp_dir, prefix="kmers-") as spill_dir:
+        for windows in iter_file_kmer_codes(source, k, alphabet, block_size, canonical):
+            if dense is not None:
+                dense += np.bincount(windows, minlength=sigma ** k)
+                continue
+
+            unique, totals = np.unique(windows, return_counts=True)
+            counts = KmerCounts(alphabet, k, unique, totals.astype(np.int64), canonical)
+
+            parts.append(counts)
+            part_bytes += counts.codes.nbytes + counts.counts.nbytes
+            if part_bytes > memory_limit:
+                codes, totals = _merge_sorted([p.codes for p in parts], [p.counts for p in parts])
+                parts = []
+                part_bytes = 0
+                if codes.nbytes + totals.nbytes > memory_limit // 2:
+                    runs.append(_save_run(spill_dir, len(runs), codes, totals))
+                else:
+                    parts = [KmerCounts(alphabet, k, codes, totals, canonical)]
+                    part_bytes = codes.nbytes + totals.nbytes
+
+        if dense is not None:
+            present = np.flatnonzero(dense)
+            return KmerCounts(alphabet, k, present.astype(np.int64), dense[present], canonical)
+
+        if parts:
+            codes, totals = _merge_sorted([p.codes for p in parts], [p.counts for p in parts])
+            if runs:
+                runs.append(_save_run(spill_dir, len(runs), codes, totals))
+        if runs:
+            codes, totals = _merge_runs(runs, memory_limit)
+        elif not parts:
+            codes, totals = _merge_sorted([], [])
+        return KmerCounts(alphabet, k, codes, totals, canonical)
+
+
+def _encode_records(sequence, alphabet: str) -> np.ndarray:
+    """Encodes one sequence, or several joined by an INVALID separator so no k-mer spans two of them."""
+    if isinstance(sequence, SEQUENCE_TYPES):
+        return encode(sequence, alphabet)
+    parts = []
+    for seq in sequence:
+        parts.append(encode(seq, alphabet))
+        parts.append(np.array([INVALID], dtype=np.uint8))
+    return np.concatenate(parts[:-1]) if parts else np.empty(0, dtype=np.uint8)
+
+
+def _count_slice(input_name: str, n: int, start: int, end: int, k: int, alphabet: str, canonical: bool,
+                 table_name: str, row: int, block: int) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Worker: counts the windows starting in [start, end) of the shared encoded
+    input. Dense counts are added to this worker's row of the shared table
+    (and nothing is returned); sparse counts are returned as two arrays.
+    """
+    from multiprocessing import shared_memory
+
+    sigma = len(alphabet)
+    input_shm = shared_memory.SharedMemory(name=input_name)
+    table_shm = shared_memory.SharedMemory(name=table_name) if table_name else None
+    try:
+        codes = np.ndarray((n,), dtype=np.uint8, buffer=input_shm.buf)
+        table = np.ndarray((row + 1, sigma ** k), dtype=np.int64, buffer=table_shm.buf)[row] if table_shm else None
+        parts_codes, parts_counts = [], []
+        window = None
+        for block_start in range(start, end, block):
+            window = codes[block_start:min(block_start + block, end) + k - 1]
+            windows = encoded_kmer_codes(window, k, alphabet, canonical)
+            if table is not None:
+                table += np.bincount(windows, minlength=sigma ** k)
+            else:
+                unique, counts = np.unique(windows, return_counts=True)
+                parts_codes.append(unique)
+                parts_counts.append(counts.astype(np.int64))
+        del codes, table, window  # Drop the views before the shared blocks are closed.
+        return _merge_sorted(parts_codes, parts_counts) if table_shm is None else None
+    finally:
+        input_shm.close()
+        if table_shm:
+            table_shm.close()
+
+
+def count_kmers_parallel(sequence: Union[Sequence, Iterable[Sequence]], k: int, alphabet: str = DNA,
+                         workers: int = None, block: int = 1 << 22, canonical: bool = False) -> KmerCounts:
+    """
+    Counts k-mers with several processes; same result as count_kmers.
+
+    The input is encoded once into a multiprocessing.shared_memory block
+    that every worker maps without copying. Each worker counts a slice of
+    the window positions, `block` windows at a time. For dense tables
+    (alphabet**k <= DENSE_LIMIT) each worker adds into its own row of a
+    shared workers x alphabet**k table, and the rows are summed at the end;
+    sparse tables come back as sorted (codes, counts) arrays and are merged.
+
+    Args:
+        sequence: One sequence, or an iterable of sequences (k-mers never span two).
+        k: The k-mer length.
+        alphabet: The symbols, case-insensitive.
+        workers: Number of processes (default: os.cpu_count()).
+        block: Windows counted per step inside a worker, bounding its memory.
+        canonical: Count k-mers and their reverse complements together.
+
+    Returns:
+        A KmerCounts table.
+    """
+    from concurrent.futures import ProcessPoolExecutor
+    from multiprocessing import shared_memory
+
+    sigma = len(alphabet)
+    if sigma ** k >= 1 << 63:
+        raise ValueError(f"{sigma}**{k} k-mers do not fit in 64-bit codes")
+    workers = workers or os.cpu_count() or 1
+
+    codes = _encode_records(sequence, alphabet)
+    n_windows = max(0, len(codes) - k + 1)
+    if n_windows == 0:
+        return KmerCounts(alphabet, k, canonical=canonical)
+    dense = sigma ** k <= DENSE_LIMIT
+
+    input_shm = shared_memory.SharedMemory(create=True, size=len(codes))
+    table_shm = shared_memory.SharedMemory(create=True, size=workers * sigma ** k * 8) if dense else None
+    try:
+        np.ndarray(codes.shape, dtype=np.uint8, buffer=input_shm.buf)[:] = codes
+        n = len(codes)
+        del codes
+        if table_shm:
+            table = np.ndarray((workers, sigma ** k), dtype=np.int64, buffer=table_shm.buf)
+            table[:] = 0
+
+        bounds = [i * n_windows // workers for i in range(workers + 1)]
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(_count_slice, input_shm.name, n, bounds[i], bounds[i + 1], k, alphabet, canonical,
+                                   table_shm.name if table_shm else None, i, block)
+                       for i in range(workers)]
+            results = [f.result() for f in futures]
+
+        if dense:
+            totals = table.sum(axis=0)
+            del table
+            present = np.flatnonzero(totals)
+            return KmerCounts(alphabet, k, present.astype(np.int64), totals[present], canonical)
+        codes, counts = _merge_sorted([r[0] for r in results], [r[1] for r in results])
+        return KmerCounts(alphabet, k, codes, counts, canonical)
+    finally:
+        for shm in (input_shm, table_shm):
+            if shm:
+                shm.close()
+                shm.unlink()
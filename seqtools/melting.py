@@ -0,0 +1,288 @@
+import math
+from typing import Iterator, Union
+
+import numpy as np
+
+Sequence = Union[str, bytes, bytearray, memoryview]
+
+# Byte -> 1 for G/C (resp. A/T), case-insensitive.
+_IS_GC = np.zeros(256, dtype=np.uint8)
+_IS_AT = np.zeros(256, dtype=np.uint8)
+for _b in b"GCgc":
+    _IS_GC[_b] = 1
+for _b in b"ATat":
+    _IS_AT[_b] = 1
+
+
+# SantaLucia (1998) unified nearest-neighbor parameters for each 5'->3'
+# dinucleotide of the top strand, in tenths: dH in 0.1 kcal/mol, dS in
+# 0.1 cal/(K*mol). Integer tenths keep the prefix sums exact.
+NN_PARAMETERS = {
+    'AA': (-79, -222), 'TT': (-79, -222),
+    'AT': (-72, -204),
+    'TA': (-72, -213),
+    'CA': (-85, -227), 'TG': (-85, -227),
+    'GT': (-84, -224), 'AC': (-84, -224),
+    'CT': (-78, -210), 'AG': (-78, -210),
+    'GA': (-82, -222), 'TC': (-82, -222),
+    'CG': (-106, -272),
+    'GC': (-98, -244),
+    'GG': (-80, -199), 'CC': (-80, -199),
+}
+# Initiation with a terminal G.C or A.T pair, applied once per duplex end.
+NN_INIT_GC = (1, -28)
+NN_INIT_AT = (23, 41)
+GAS_CONSTANT = 1.987  # cal/(K*mol)
+
+# Byte -> 2-bit base code (A=0, C=1, G=2, T=3), case-insensitive; 255 elsewhere.
+_NN_CODE = np.full(256, 255, dtype=np.uint8)
+for _code, _letters in enumerate((b"Aa", b"Cc", b"Gg", b"Tt")):
+    for _b in _letters:
+        _NN_CODE[_b] = _code
+
+_NN_DH = np.zeros(16, dtype=np.int64)
+_NN_DS = np.zeros(16, dtype=np.int64)
+for _pair, (_dh, _ds) in NN_PARAMETERS.items():
+    _index = 4 * "ACGT".index(_pair[0]) + "ACGT".index(_pair[1])
+    _NN_DH[_index], _NN_DS[_index] = _dh, _ds
+_END_DH = np.array([NN_INIT_AT[0], NN_INIT_GC[0], NN_INIT_GC[0], NN_INIT_AT[0]], dtype=np.int64)
+_END_DS = np.array([NN_INIT_AT[1], NN_INIT_GC[1], NN_INIT_GC[1], NN_INIT_AT[1]], dtype=np.int64)
+
+
+def _as_bytes(sequence: Sequence) -> np.ndarray:
+    if isinstance(sequence, str):
+        sequence = sequence.encode('ascii', errors='replace')
+    return np.frombuffer(sequence, dtype=np.uint8)
+
+
+class BasePrefixSums:
+    """
+    Cumulative G+C and A+T counts of a sequence, built once in O(n).
+
+    The count in any window [i, i + w) is then gc[i + w] - gc[i], so the
+    counts of all windows of any size cost one vectorized subtraction.
+
+    Usage:
+        sums = BasePrefixSums(sequence)
+        gc = sums.gc_counts(9)        # G+C in every 9-base window
+    """
+
+    def __init__(self, sequence: Sequence):
+        raw = _as_bytes(sequence)
+        dtype = np.int32 if len(raw) < 2 ** 31 else np.int64
+        self.length = len(raw)
+        self.gc = np.concatenate(([0], np.cumsum(_IS_GC[raw], dtype=dtype)))
+        self.at = np.concatenate(([0], np.cumsum(_IS_AT[raw], dtype=dtype)))
+
+    def __len__(self) -> int:
+        return self.length
+
+    def n_windows(self, window_size: int) -> int:
+        return max(0, self.length - window_size + 1)
+
+    def gc_counts(self, window_size: int) -> np.ndarray:
+        """G+C count of every window, indexed by window start."""
+        return self.gc[window_size:] - self.gc[:-window_size] if self.n_windows(window_size) else self.gc[:0]
+
+    def at_counts(self, window_size: int) -> np.ndarray:
+        """A+T count of every window, indexed by window start."""
+        return self.at[window_size:] - self.at[:-window_size] if self.n_windows(window_size) else self.at[:0]
+
+
+def _prefix_sums(sequence: Union[Sequence, BasePrefixSums]) -> BasePrefixSums:
+    return sequence if isinstance(sequence, BasePrefixSums) else BasePrefixSums(sequence)
+
+
+def wallace_tm(sequence: Union[Sequence, BasePrefixSums], window_size: int = 9) -> np.ndarray:
+    """
+    Wallace rule Tm = 4(G+C) + 2(A+T) of every window.
+
+    Args:
+        sequence: The sequence, or its BasePrefixSums to reuse them.
+        window_size: Window length in bases.
+
+    Returns:
+        An integer array with one Tm per window start.
+    """
+    sums = _prefix_sums(sequence)
+    return 4 * sums.gc_counts(window_size).astype(np.int64) + 2 * sums.at_counts(window_size)
+
+
+def salt_adjusted_table(window_size: int, na: float = 0.05) -> np.ndarray:
+    """
+    Salt-adjusted Tm = 81.5 + 16.6 log10([Na+]) + 0.41 %GC - 600 / length,
+    rounded to 2 decimals, for each possible G+C count (0..window_size)
+    of a window. The formula is evaluated in Python for each count, so the
+    values are exactly those of the per-window computation.
+    """
+    log_na = math.log10(na)
+    return np.array([round(81.5 + 16.6 * log_na + 0.41 * ((gc / window_size) * 100) - (600 / window_size), 2)
+                     for gc in range(window_size + 1)])
+
+
+def salt_adjusted_tm(sequence: Union[Sequence, BasePrefixSums], window_size: int = 9,
+                     na: float = 0.05) -> np.ndarray:
+    """
+    Salt-adjusted Tm of every window (see salt_adjusted_table).
+
+    Args:
+        sequence: The sequence, or its BasePrefixSums to reuse them.
+        window_size: Window length in bases.
+        na: Monovalent cation concentration in mol/L.
+
+    Returns:
+        A float array with one Tm per window start.
+    """
+    sums = _prefix_sums(sequence)
+    return salt_adjusted_table(window_size, na)[sums.gc_counts(window_size)]
+
+
+def calculate_tm_signals(sequence: Union[Sequence, BasePrefixSums], window_size: int = 9,
+                         na: float = 0.001) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Wallace and salt-adjusted Tm profiles of a sequence, from one set of
+    prefix sums: O(n) in total instead of O(n * window_size).
+
+    Returns:
+        (wallace, salt_adjusted) arrays indexed by window start.
+    """
+    sums = _prefix_sums(sequence)
+    return wallace_tm(sums, window_size), salt_adjusted_tm(sums, window_size, na)
+
+
+class NearestNeighborSums:
+    """
+    Prefix sums of the nearest-neighbor dH and dS of a sequence.
+
+    Each of the 16 dinucleotides contributes its (dH, dS) at its position;
+    the cumulative sums make the stacking total of any window one
+    subtraction, so all windows of any size cost O(n) together.
+
+    Usage:
+        sums = NearestNeighborSums(sequence)
+        tm = nearest_neighbor_tm(sums, 20)
+    """
+
+    def __init__(self, sequence: Sequence):
+        codes = _NN_CODE[_as_bytes(sequence)]
+        self.length = len(codes)
+        invalid = codes == 255
+        self.invalid = np.concatenate(([0], np.cumsum(invalid, dtype=np.int64)))
+        clean = np.where(invalid, 0, codes).astype(np.int64)
+        pairs = 4 * clean[:-1] + clean[1:] if self.length > 1 else clean[:0]
+        self.dh = np.concatenate(([0], np.cumsum(_NN_DH[pairs])))
+        self.ds = np.concatenate(([0], np.cumsum(_NN_DS[pairs])))
+        self.clean = clean
+
+    def __len__(self) -> int:
+        return self.length
+
+    def window_terms(self, window_size: int) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Returns (dH, dS, valid) of every window: the stacking sums plus both
+        initiation terms, in tenths, and a mask of the windows with only A/C/G/T.
+        """
+        n = max(0, self.length - window_size + 1)
+        last = window_size - 1
+        dh = self.dh[last:last + n] - self.dh[:n]
+        ds = self.ds[last:last + n] - self.ds[:n]
+        first_base, last_base = self.clean[:n], self.clean[last:last + n]
+        dh = dh + _END_DH[first_base] + _END_DH[last_base]
+        ds = ds + _END_DS[first_base] + _END_DS[last_base]
+        valid = self.invalid[window_size:window_size + n] == self.invalid[:n]
+        return dh, ds, valid
+
+
+def nearest_neighbor_tm(sequence: Union[Sequence, NearestNeighborSums], window_size: int = 9,
+                        na: float = 0.05, oligo_conc: float = 250e-9) -> np.ndarray:
+    """
+    SantaLucia (1998) nearest-neighbor Tm of every window:
+
+        Tm = 1000 dH / (dS + 0.368 (N - 1) ln[Na+] + R ln(C / 4)) - 273.15
+
+    with dH, dS the sums of the window's dinucleotide stacks and both
+    initiation terms, N the window length and C the total strand
+    concentration (two non-self-complementary strands in equal amounts).
+
+    Args:
+        sequence: The sequence, or its NearestNeighborSums to reuse them.
+        window_size: Window length in bases (at least 2).
+        na: Monovalent cation concentration in mol/L.
+        oligo_conc: Total strand concentration in mol/L.
+
+    Returns:
+        A float array with one Tm (degrees C, rounded to 2 decimals) per
+        window start; NaN for windows containing a base other than A/C/G/T.
+    """
+    if window_size < 2:
+        raise ValueError("nearest-neighbor Tm needs windows of at least 2 bases")
+    sums = sequence if isinstance(sequence, NearestNeighborSums) else NearestNeighborSums(sequence)
+    dh, ds, valid = sums.window_terms(window_size)
+    salt = 0.368 * (window_size - 1) * math.log(na)
+    tm = 100.0 * dh / (ds / 10.0 + salt + GAS_CONSTANT * math.log(oligo_conc / 4)) - 273.15
+    tm = np.round(tm, 2)
+    tm[~valid] = np.nan
+    return tm
+
+
+TM_METHODS = ('wallace', 'salt', 'nn')
+
+
+def tm_sweep(sequence: Sequence, window_sizes, method: str = 'nn', na: float = 0.05,
+             oligo_conc: float = 250e-9, dtype=np.float64) -> np.ndarray:
+    """
+    Tm of every window for several window sizes at once.
+
+    The prefix sums are built once and shared by all window sizes, so each
+    extra size costs one vectorized pass and no re-scan of the sequence.
+
+    Args:
+        sequence: The sequence.
+        window_sizes: The window lengths, e.g. range(15, 41).
+        method: 'wallace', 'salt' (salt-adjusted GC formula) or 'nn'
+            (nearest-neighbor).
+        na: Monovalent cation concentration in mol/L ('salt' and 'nn').
+        oligo_conc: Total strand concentration in mol/L ('nn').
+        dtype: Output dtype; np.float32 halves the memory.
+
+    Returns:
+        A (len(window_sizes), n) matrix, where n is the number of windows of
+        the smallest size; row i holds the Tm of each window start for
+        window_sizes[i], padded with NaN where the window runs past the end.
+    """
+    if method not in TM_METHODS:
+        raise ValueError(f"method must be one of {TM_METHODS}")
+    window_sizes = list(window_sizes)
+    sums = NearestNeighborSums(sequence) if method == 'nn' else BasePrefixSums(sequence)
+    n = max(0, len(sums) - min(window_sizes) + 1) if window_sizes else 0
+    matrix = np.full((len(window_sizes), n), np.nan, dtype=dtype)
+
+    for row, size in enumerate(window_sizes):
+        if method == 'wallace':
+            values = wallace_tm(sums, size)
+        elif method == 'salt':
+            values = salt_adjusted_tm(sums, size, na)
+        else:
+            values = nearest_neighbor_tm(sums, size, na, oligo_conc)
+        matrix[row, :len(values)] = values
+    return matrix
+
+
+def iter_tm(sequence: Sequence, window_size: int = 9, method: str = 'nn', na: float = 0.05,
+            oligo_conc: float = 250e-9, chunk_size: int = 1 << 20) -> Iterator[np.ndarray]:
+    """
+    Yields the Tm profile of a sequence in consecutive chunks of
+    `chunk_size` window starts, so a chromosome-long profile is never held
+    in memory at once. Concatenated, the chunks equal the full profile.
+    """
+    if method not in TM_METHODS:
+        raise ValueError(f"method must be one of {TM_METHODS}")
+    n = max(0, len(sequence) - window_size + 1)
+    for start in range(0, n, chunk_size):
+        piece = sequence[start:start + chunk_size + window_size - 1]
+        if method == 'wallace':
+            yield wallace_tm(piece, window_size)
+        elif method == 'salt':
+            yield salt_adjusted_tm(piece, window_size, na)
+        else:
+            yield nearest_neighbor_tm(piece, window_size, na, oligo_conc)
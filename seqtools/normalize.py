@@ -0,0 +1,79 @@
+import string
+from functools import lru_cache
+from typing import NamedTuple, Union
+
+import numpy as np
+
+NUCLEOTIDES = b"ACGT"
+IUPAC_NUCLEOTIDES = b"ACGTURYSWKMBDHVN"
+AMBIGUITY_CODES = b"RYSWKMBDHVN"
+LETTERS = string.ascii_uppercase.encode()
+
+# Characters that are removed without being reported: whitespace and the
+# position numbers found in GenBank/EMBL style sequence blocks.
+IGNORED = (string.whitespace + string.digits).encode()
+
+
+class NormalizedSequence(NamedTuple):
+    sequence: bytes
+    invalid_positions: np.ndarray  # offsets in the input of the rejected characters
+
+
+@lru_cache(maxsize=None)
+def _tables(alphabet: bytes, ambiguous: str) -> tuple[bytes, bytes, bytes, np.ndarray]:
+    """Builds (translate table, delete set, non-invalid set, invalid lookup) for one configuration."""
+    mapping = bytearray(range(256))
+    for lower, upper in zip(string.ascii_lowercase.encode(), string.ascii_uppercase.encode()):
+        mapping[lower] = upper
+    if ambiguous == "N":
+        for b in range(256):
+            if mapping[b] in AMBIGUITY_CODES:
+                mapping[b] = ord('N')
+
+    kept = set(alphabet)
+    if ambiguous == "drop":
+        kept -= set(AMBIGUITY_CODES)
+    elif ambiguous == "N" and kept & set(AMBIGUITY_CODES):
+        kept.add(ord('N'))
+
+    keep = [mapping[b] in kept for b in range(256)]
+    ignored = [b in IGNORED or (ambiguous == "drop" and mapping[b] in AMBIGUITY_CODES) for b in range(256)]
+    invalid = np.array([not k and not i for k, i in zip(keep, ignored)])
+
+    delete = bytes(b for b in range(256) if not keep[b])
+    not_invalid = bytes(b for b in range(256) if not invalid[b])
+    return bytes(mapping), delete, not_invalid, invalid
+
+
+def normalize_sequence(data: Union[bytes, str], alphabet: bytes = IUPAC_NUCLEOTIDES,
+                       ambiguous: str = "keep") -> NormalizedSequence:
+    """
+    Cleans a raw sequence buffer with byte translation tables instead of a
+    per-character Python loop.
+
+    Letters are uppercased, whitespace and digits are dropped, and every
+    other character outside `alphabet` is dropped and reported.
+
+    Args:
+        data: The raw sequence (bytes, or str, whose non-ASCII characters are
+            treated as invalid).
+        alphabet: The uppercase characters to keep.
+        ambiguous: What to do with IUPAC ambiguity codes (R, Y, ..., N):
+            "keep" them, map them all to "N", or "drop" them silently.
+
+    Returns:
+        NormalizedSequence(sequence, invalid_positions), where the positions
+        are offsets into `data`.
+    """
+    if ambiguous not in ("keep", "N", "drop"):
+        raise ValueError("ambiguous must be 'keep', 'N' or 'drop'")
+    if isinstance(data, str):
+        data = data.encode('ascii', errors='replace')
+
+    table, delete, not_invalid, invalid = _tables(bytes(alphabet), ambiguous)
+    cleaned = data.translate(table, delete)
+
+    positions = np.empty(0, dtype=np.int64)
+    if data.translate(None, not_invalid):
+        positions = np.flatnonzero(invalid[np.frombuffer(data, dtype=np.uint8)])
+    return NormalizedSequence(cleaned, positions)
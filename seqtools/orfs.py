@@ -0,0 +1,114 @@
+from typing import Iterable, Iterator, NamedTuple
+
+import numpy as np
+
+from seqtools.codons import DNA, INVALID_CODON, CodonTable, Sequence, codon_index_stream, codon_indices, encode_bases
+
+
+class Orf(NamedTuple):
+    start: int     # first base of the start codon, forward-strand coordinates
+    end: int       # one past the last base (stop codon included), half-open
+    strand: str    # '+' or '-'
+    frame: int     # 0-2, offset of the first codon on its own strand
+    protein: str   # amino acids, stop codon excluded
+
+
+def six_frame_codons(sequence: Sequence, alphabet: str = DNA) -> tuple[list[np.ndarray], list[np.ndarray]]:
+    """
+    Codon index arrays of the six reading frames, from a single encoding of
+    the sequence.
+
+    The 2-bit codes are computed once; the reverse complement is the
+    reversed array of 3 - code (the complement in A, C, G, T/U order), and
+    the codon at every position of each strand is built with one vectorized
+    expression, so frame f is just a stride-3 view starting at f.
+
+    Args:
+        sequence: The forward strand.
+        alphabet: The bases in complement-symmetric order, DNA ("ACGT") or RNA ("ACGU").
+
+    Returns:
+        (forward, reverse): three arrays each, frame 0, 1, 2 of the forward
+        strand and of the reverse complement (frames counted from its own 5' end).
+    """
+    return _six_frames(encode_bases(sequence, alphabet))
+
+
+def _six_frames(codes: np.ndarray) -> tuple[list[np.ndarray], list[np.ndarray]]:
+    """six_frame_codons() of an already encoded sequence."""
+    reverse_codes = np.where(codes == 255, 255, 3 - codes).astype(np.uint8)[::-1]
+    forward_all = codon_index_stream(codes)
+    reverse_all = codon_index_stream(reverse_codes)
+    return [forward_all[f::3] for f in range(3)], [reverse_all[f::3] for f in range(3)]
+
+
+def _frame_orfs(codons: np.ndarray, is_start: np.ndarray, is_stop: np.ndarray,
+                min_length: int, partial: bool) -> tuple[np.ndarray, np.ndarray]:
+    """
+    ORFs of one frame as codon ranges: for every stop codon, the first start
+    codon after the previous stop (the longest ORF ending there).
+
+    Returns:
+        (first, last): codon index of the start codon and of the stop codon
+        (len(codons) for an ORF running off the end).
+    """
+    stops = np.flatnonzero(is_stop[codons])
+    starts = np.flatnonzero(is_start[codons])
+    ends = np.append(stops, len(codons)) if partial else stops
+    previous = np.concatenate(([-1], stops))[:len(ends)]
+    first_after = np.searchsorted(starts, previous + 1)
+    found = first_after < len(starts)
+    first = np.full(len(ends), len(codons), dtype=np.int64)
+    first[found] = starts[first_after[found]]
+    keep = (first < ends) & (ends - first >= min_length)
+    return first[keep], ends[keep]
+
+
+def iter_orfs(sequence: Sequence, min_length: int = 100, table: CodonTable = None,
+              starts: Iterable[str] = None, partial: bool = False, sep: str = "-") -> Iterator[Orf]:
+    """
+    Finds the open reading frames of all six frames and yields them ordered
+    by forward-strand start.
+
+    The six codon arrays are built in one pass (six_frame_codons); start and
+    stop codons are located with array searches and each stop is paired with
+    the first start after the previous in-frame stop. Only the protein
+    strings are produced lazily, one ORF at a time, as they are yielded.
+
+    Args:
+        sequence: The forward strand (DNA by default; the table's alphabet decides).
+        min_length: Minimum ORF length in codons, stop excluded.
+        table: The genetic code; default: the standard code on DNA.
+        starts: Start codons; default: the table's start codon.
+        partial: Also report ORFs that run off the end without a stop codon.
+        sep: Separator between amino acid names.
+
+    Yields:
+        Orf(start, end, strand, frame, protein).
+    """
+    table = table or CodonTable(alphabet=DNA)
+    is_start = np.zeros(INVALID_CODON + 1, dtype=bool)
+    for codon in starts or (table.start,):
+        is_start[codon_indices(codon, alphabet=table.alphabet)] = True
+    is_start[INVALID_CODON] = False
+
+    codes = encode_bases(sequence, table.alphabet)
+    n = len(codes)
+    forward, reverse = _six_frames(codes)
+
+    frames = []
+    columns = []  # per frame: forward start, forward end, frame number, first codon, last codon
+    for strand, strand_frames in (('+', forward), ('-', reverse)):
+        for frame, codons in enumerate(strand_frames):
+            first, last = _frame_orfs(codons, is_start, table.is_stop, min_length, partial)
+            end_codon = np.minimum(last + 1, len(codons))
+            nt_start, nt_end = frame + 3 * first, frame + 3 * end_codon
+            if strand == '-':
+                nt_start, nt_end = n - nt_end, n - nt_start
+            frames.append((strand, frame, codons))
+            columns.append(np.stack((nt_start, nt_end, np.full(len(first), len(frames) - 1), first, last)))
+
+    found = np.concatenate(columns, axis=1)
+    for nt_start, nt_end, which, first, last in found[:, np.lexsort((found[2], found[0]))].T.tolist():
+        strand, frame, codons = frames[which]
+        yield Orf(nt_start, nt_end, strand, frame, table.translate_indices(codons[first:last], sep, to_stop=False))
@@ -0,0 +1,231 @@
+import operator
+from typing import Union
+
+import numpy as np
+
+BASES = b"ACGT"
+RNA_BASES = b"ACGU"
+
+# ASCII byte -> 2-bit code (A=0, C=1, G=2, T=3); 255 marks anything else.
+# RNA (U but no T) is packed with U as code 3 instead; a sequence that mixes
+# T and U keeps its U bases in the side table.
+_ENCODE = np.full(256, 255, dtype=np.uint8)
+for _code, _letters in enumerate((b"Aa", b"Cc", b"Gg", b"Tt")):
+    for _letter in _letters:
+        _ENCODE[_letter] = _code
+_ENCODE_RNA = _ENCODE.copy()
+_ENCODE_RNA[[ord('T'), ord('t')]] = 255
+_ENCODE_RNA[[ord('U'), ord('u')]] = 3
+
+_DECODE = np.frombuffer(BASES, dtype=np.uint8)
+_DECODE_RNA = np.frombuffer(RNA_BASES, dtype=np.uint8)
+
+# Complements of the characters kept in the ambiguity runs (IUPAC codes, U).
+_RUN_COMPLEMENT = np.arange(256, dtype=np.uint8)
+for _a, _b in zip(b"RYKMBVDHU", b"YRMKVBHDA"):
+    _RUN_COMPLEMENT[_a] = _b
+
+_SHIFTS = np.array([6, 4, 2, 0], dtype=np.uint8)
+
+
+def _pack(codes: np.ndarray) -> np.ndarray:
+    """Packs 2-bit codes four to a byte, first base in the high bits."""
+    padded = np.zeros((len(codes) + 3) // 4 * 4, dtype=np.uint8)
+    padded[:len(codes)] = codes
+    quads = padded.reshape(-1, 4)
+    return (quads[:, 0] << 6) | (quads[:, 1] << 4) | (quads[:, 2] << 2) | quads[:, 3]
+
+
+def _find_runs(raw: np.ndarray, ambiguous: np.ndarray) -> np.ndarray:
+    """Returns (start, end, char) rows for maximal runs of one ambiguous character."""
+    idx = np.flatnonzero(ambiguous)
+    if len(idx) == 0:
+        return np.empty((0, 3), dtype=np.int64)
+    chars = raw[idx]
+    breaks = np.flatnonzero((np.diff(idx) != 1) | (np.diff(chars) != 0)) + 1
+    first = np.concatenate(([0], breaks))
+    last = np.concatenate((breaks - 1, [len(idx) - 1]))
+    return np.stack((idx[first], idx[last] + 1, chars[first].astype(np.int64)), axis=1)
+
+
+def _run_positions(runs: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Expands (start, end, char) runs into per-position indices and characters."""
+    lengths = runs[:, 1] - runs[:, 0]
+    offsets = np.repeat(runs[:, 0] - np.concatenate(([0], np.cumsum(lengths)[:-1])), lengths)
+    positions = np.arange(lengths.sum()) + offsets
+    return positions, np.repeat(runs[:, 2], lengths).astype(np.uint8)
+
+
+class PackedSequence:
+    """
+    A nucleotide sequence stored as 2-bit codes, four bases per byte.
+
+    A, C, G and T are packed; every other character (N, IUPAC ambiguity
+    codes, gaps) is stored as a run in a small side table and packed as 'A'.
+    RNA (U but no T) is packed with U in place of T and flagged `rna`, so it
+    costs the same as DNA; U in a sequence that also has T goes to the side
+    table. Lowercase (soft-masked) bases are uppercased on the way in.
+
+    Slicing with step 1 returns a view that shares the packed buffer, so
+    windows of a genome cost no copies.
+
+    Usage:
+        seq = PackedSequence.from_str(genome)
+        window = seq[1000:1500]          # zero-copy view
+        gc = window.base_counts()        # {'A': ..., 'C': ..., 'G': ..., 'T': ...}
+        str(window.reverse_complement())
+    """
+
+    __slots__ = ('_packed', '_offset', '_length', '_runs', '_rna')
+
+    def __init__(self, packed: np.ndarray, length: int, offset: int = 0, runs: np.ndarray = None,
+                 rna: bool = False):
+        """
+        Args:
+            packed: uint8 array holding the 2-bit codes.
+            length: Number of bases in this sequence.
+            offset: Index of the first base inside `packed`.
+            runs: (start, end, char) rows in `packed` coordinates for the
+                characters that are not A/C/G/T, sorted by start.
+            rna: Code 3 is U instead of T.
+        """
+        self._packed = packed
+        self._offset = offset
+        self._length = length
+        self._runs = runs if runs is not None else np.empty((0, 3), dtype=np.int64)
+        self._rna = rna
+
+    @classmethod
+    def from_str(cls, sequence: Union[str, bytes]) -> "PackedSequence":
+        if isinstance(sequence, str):
+            sequence = sequence.encode('ascii')
+        raw = np.frombuffer(sequence, dtype=np.uint8)
+        rna = (b'U' in sequence or b'u' in sequence) and not (b'T' in sequence or b't' in sequence)
+        codes = (_ENCODE_RNA if rna else _ENCODE)[raw]
+        ambiguous = codes == 255
+        runs = np.empty((0, 3), dtype=np.int64)
+        if ambiguous.any():
+            upper = np.where((raw >= 97) & (raw <= 122), raw - 32, raw).astype(np.uint8)
+            runs = _find_runs(upper, ambiguous)
+            codes[ambiguous] = 0
+        return cls(_pack(codes), len(raw), 0, runs, rna)
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __repr__(self) -> str:
+        preview = str(self[:20]) + ("..." if self._length > 20 else "")
+        return f"PackedSequence('{preview}', length={self._length})"
+
+    def __str__(self) -> str:
+        return self.to_bytes().decode('ascii')
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, PackedSequence):
+            return len(self) == len(other) and self.to_bytes() == other.to_bytes()
+        if isinstance(other, str):
+            return str(self) == other
+        return NotImplemented
+
+    __hash__ = None  # Equal to plain strings, so a hash would cost a full decode.
+
+    def __getitem__(self, key):
+        if not isinstance(key, slice):
+            key = operator.index(key)  # int, np.int64, ...
+            if key < 0:
+                key += self._length
+            if not 0 <= key < self._length:
+                raise IndexError("PackedSequence index out of range")
+            return str(self[key:key + 1])
+
+        start, stop, step = key.indices(self._length)
+        if step != 1:
+            return PackedSequence.from_str(str(self)[key])
+        length = max(0, stop - start)
+        return PackedSequence(self._packed, length, self._offset + start, self._runs, self._rna)
+
+    @property
+    def rna(self) -> bool:
+        """True when code 3 stands for U (an RNA sequence)."""
+        return self._rna
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the packed codes and the ambiguity table."""
+        return self._packed.nbytes + self._runs.nbytes
+
+    def buffers(self) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Returns (packed, runs) for storing the sequence, with the first base
+        in the high bits of packed[0] and runs in sequence coordinates.
+        Byte-aligned views are returned without copying the packed codes.
+        """
+        if self._offset % 4 == 0:
+            first = self._offset // 4
+            packed = self._packed[first:first + (self._length + 3) // 4]
+        else:
+            packed = _pack(self.codes())
+        return packed, self.ambiguity_runs()
+
+    def codes(self) -> np.ndarray:
+        """Returns one uint8 code (0..3 for A, C, G, T/U) per base; ambiguous bases read as 0."""
+        first = self._offset // 4
+        last = (self._offset + self._length + 3) // 4
+        unpacked = ((self._packed[first:last, None] >> _SHIFTS) & 3).ravel()
+        skip = self._offset % 4
+        return unpacked[skip:skip + self._length]
+
+    def ambiguity_runs(self) -> np.ndarray:
+        """Returns the (start, end, char) runs of non-ACGT characters in view coordinates."""
+        runs = self._runs
+        if len(runs) == 0:
+            return runs
+        lo, hi = self._offset, self._offset + self._length
+        first = np.searchsorted(runs[:, 1], lo, side='right')
+        last = np.searchsorted(runs[:, 0], hi, side='left')
+        view = runs[first:last].copy()
+        view[:, 0] = np.maximum(view[:, 0], lo) - lo
+        view[:, 1] = np.minimum(view[:, 1], hi) - lo
+        return view
+
+    def ambiguity_mask(self) -> np.ndarray:
+        """Returns a boolean array that is True at non-ACGT positions."""
+        mask = np.zeros(self._length, dtype=bool)
+        runs = self.ambiguity_runs()
+        if len(runs):
+            mask[_run_positions(runs)[0]] = True
+        return mask
+
+    def to_bytes(self) -> bytes:
+        out = (_DECODE_RNA if self._rna else _DECODE)[self.codes()]
+        runs = self.ambiguity_runs()
+        if len(runs):
+            positions, chars = _run_positions(runs)
+            out[positions] = chars
+        return out.tobytes()
+
+    def base_counts(self) -> dict[str, int]:
+        """Counts A, C, G and T (U for RNA), leaving out the ambiguous positions."""
+        counts = np.bincount(self.codes(), minlength=4)
+        runs = self.ambiguity_runs()
+        if len(runs):
+            counts[0] -= int((runs[:, 1] - runs[:, 0]).sum())
+        return {chr(b): int(c) for b, c in zip(RNA_BASES if self._rna else BASES, counts)}
+
+    def complement(self) -> "PackedSequence":
+        """Complements every base; A<->T/U and C<->G are a bit flip of the packed bytes."""
+        first = self._offset // 4
+        last = (self._offset + self._length + 3) // 4
+        runs = self.ambiguity_runs()
+        runs[:, 2] = _RUN_COMPLEMENT[runs[:, 2]]
+        skip = self._offset % 4
+        runs[:, :2] += skip
+        return PackedSequence(~self._packed[first:last], self._length, skip, runs, self._rna)
+
+    def reverse_complement(self) -> "PackedSequence":
+        codes = 3 - self.codes()[::-1]
+        runs = self.ambiguity_runs()[::-1].copy()
+        if len(runs):
+            runs[:, [0, 1]] = self._length - runs[:, [1, 0]]
+            runs[:, 2] = _RUN_COMPLEMENT[runs[:, 2]]
+        return PackedSequence(_pack(codes), self._length, 0, runs, self._rna)
@@ -0,0 +1,134 @@
+import heapq
+from typing import NamedTuple
+
+import numpy as np
+
+from seqtools.melting import (BasePrefixSums, NearestNeighborSums, Sequence, TM_METHODS,
+                              nearest_neighbor_tm, salt_adjusted_tm, wallace_tm)
+
+
+class PrimerCandidate(NamedTuple):
+    start: int
+    length: int
+    tm: float
+    gc_percent: float
+    penalty: float
+    sequence: str
+
+
+def _run_end_prefix(raw: np.ndarray, max_homopolymer: int) -> np.ndarray:
+    """
+    Prefix sums of the positions that end a run of more than
+    `max_homopolymer` identical bases; a window contains such a run iff the
+    sum over its positions max_homopolymer.. is non-zero.
+    """
+    same = (raw[1:] == raw[:-1]).astype(np.int64)
+    same_sums = np.concatenate(([0], np.cumsum(same)))
+    ends = np.zeros(len(raw), dtype=np.int64)
+    if len(raw) > max_homopolymer:
+        # Position p ends a long run when raw[p-max_homopolymer..p] are all equal.
+        ends[max_homopolymer:] = (same_sums[max_homopolymer:] - same_sums[:-max_homopolymer]) == max_homopolymer
+    return np.concatenate(([0], np.cumsum(ends)))
+
+
+def find_primers(sequence: Sequence, lengths=range(18, 26), tm_range: tuple[float, float] = (55.0, 65.0),
+                 gc_range: tuple[float, float] = (40.0, 60.0), method: str = 'nn', max_homopolymer: int = 4,
+                 clamp_window: int = 5, max_clamp_gc: int = 3, region_size: int = None, top_n: int = 5,
+                 na: float = 0.05, oligo_conc: float = 250e-9) -> dict[int, list[PrimerCandidate]]:
+    """
+    Finds the best primer/probe candidates of a sequence (forward strand).
+
+    Every window of every candidate length is evaluated at once: the
+    prefix sums behind the Tm and GC content are built once, and each
+    filter is a boolean mask over all window starts:
+      * Tm (method 'nn', 'wallace' or 'salt') within tm_range,
+      * GC content within gc_range,
+      * only A/C/G/T bases,
+      * no homopolymer run longer than max_homopolymer,
+      * at most max_clamp_gc G/C among the last clamp_window (3') bases.
+    Passing windows are ranked by penalty = |Tm - target| + 0.1 |GC% - 50|
+    (target = middle of tm_range), and a bounded heap keeps the top_n of
+    each region.
+
+    Args:
+        sequence: The template sequence.
+        lengths: Candidate lengths in bases.
+        tm_range, gc_range: Inclusive (min, max) ranges, in degrees C and percent.
+        method: Tm method, as in melting.tm_sweep.
+        max_homopolymer: Longest allowed run of one base (at least 1).
+        clamp_window, max_clamp_gc: The 3'-end GC limit.
+        region_size: Report the top candidates of each region of this many
+            bases (by start position); default: the whole sequence is one region.
+        top_n: Candidates kept per region.
+        na, oligo_conc: Salt and strand concentrations in mol/L.
+
+    Returns:
+        {region_start: [PrimerCandidate, ...]} with the candidates best first.
+    """
+    if method not in TM_METHODS:
+        raise ValueError(f"method must be one of {TM_METHODS}")
+    if max_homopolymer < 1:
+        raise ValueError("max_homopolymer must be at least 1")
+    if isinstance(sequence, str):
+        text = sequence
+        sequence = sequence.encode('ascii', errors='replace')
+    else:
+        text = bytes(sequence).decode('ascii', errors='replace')
+    raw = np.frombuffer(sequence, dtype=np.uint8)
+    region_size = region_size or max(1, len(raw))
+    target_tm = (tm_range[0] + tm_range[1]) / 2
+
+    base_sums = BasePrefixSums(sequence)
+    nn_sums = NearestNeighborSums(sequence) if method == 'nn' else None
+    long_runs = _run_end_prefix(raw, max_homopolymer)
+
+    heaps = {}
+    for length in lengths:
+        n = base_sums.n_windows(length)
+        if n == 0:
+            continue
+        if method == 'nn':
+            tm = nearest_neighbor_tm(nn_sums, length, na, oligo_conc)
+        elif method == 'wallace':
+            tm = wallace_tm(base_sums, length).astype(np.float64)
+        else:
+            tm = salt_adjusted_tm(base_sums, length, na)
+
+        gc = base_sums.gc_counts(length)
+        gc_percent = 100.0 * gc / length
+        tail = min(clamp_window, length)
+        clamp = base_sums.gc[length:] - base_sums.gc[length - tail:len(base_sums.gc) - tail]
+        starts = np.arange(n)
+        runs_inside = long_runs[starts + length] - long_runs[np.minimum(starts + max_homopolymer, starts + length)]
+
+        ok = ((tm >= tm_range[0]) & (tm <= tm_range[1])
+              & (gc_percent >= gc_range[0]) & (gc_percent <= gc_range[1])
+              & (gc + base_sums.at_counts(length) == length)
+              & (runs_inside == 0)
+              & (clamp[:n] <= max_clamp_gc))
+        hits = np.flatnonzero(ok)
+        if len(hits) == 0:
+            continue
+
+        # Best top_n of this length in each region, found with one lexsort.
+        penalty = np.abs(tm[hits] - target_tm) + 0.1 * np.abs(gc_percent[hits] - 50.0)
+        region = hits // region_size
+        order = np.lexsort((hits, penalty, region))
+        region_sorted = region[order]
+        first_of_region = np.searchsorted(region_sorted, region_sorted, side='left')
+        best = order[np.arange(len(order)) - first_of_region < top_n]
+
+        for i in best:
+            start = int(hits[i])
+            candidate = PrimerCandidate(start, length, float(tm[start]), float(gc_percent[start]),
+                                        float(penalty[i]), text[start:start + length])
+            heap = heaps.setdefault(int(region[i]) * region_size, [])
+            # Max-heap on penalty (ties: later start, longer) holding the top_n smallest.
+            item = (-candidate.penalty, -candidate.start, -candidate.length, candidate)
+            if len(heap) < top_n:
+                heapq.heappush(heap, item)
+            elif item > heap[0]:
+                heapq.heapreplace(heap, item)
+
+    return {region_start: [item[3] for item in sorted(heap, reverse=True)]
+            for region_start, heap in sorted(heaps.items())}
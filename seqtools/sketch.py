@@ -0,0 +1,241 @@
+import math
+from typing import Iterable, Union
+
+import numpy as np
+
+from seqtools.kmers import DNA, SEQUENCE_TYPES, Sequence, iter_file_kmer_codes, kmer_codes
+
+_MASK64 = np.uint64(0xFFFFFFFFFFFFFFFF)
+
+
+def splitmix64(values: np.ndarray, seed: int = 0) -> np.ndarray:
+    """
+    Hashes 64-bit integers with the SplitMix64 finalizer (vectorized).
+
+    The same value and seed always give the same hash, across runs and
+    machines, which is what makes sketches built from different files mergeable.
+    """
+    with np.errstate(over='ignore'):
+        z = values.astype(np.uint64) + np.uint64((0x9E3779B97F4A7C15 * (seed + 1)) & 0xFFFFFFFFFFFFFFFF)
+        z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+        z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+        return z ^ (z >> np.uint64(31))
+
+
+def _leading_zeros(values: np.ndarray) -> np.ndarray:
+    """Counts the leading zero bits of uint64 values (64 for zero)."""
+    x = values.copy()
+    zeros = np.zeros(len(x), dtype=np.int64)
+    for shift in (32, 16, 8, 4, 2, 1):
+        small = x < np.uint64(1 << (64 - shift))
+        zeros[small] += shift
+        x[small] <<= np.uint64(shift)
+    zeros[values == 0] = 64
+    return zeros
+
+
+class CountMinSketch:
+    """
+    Approximate counts of 64-bit keys (k-mer codes) in a fixed-size table.
+
+    With width = ceil(e / epsilon) and depth = ceil(ln(1 / delta)), a
+    query never under-counts and over-counts by more than epsilon * total
+    with probability at least 1 - delta. Memory is width * depth * 8 bytes
+    whatever the number of distinct keys. Sketches with the same
+    parameters and seed can be merged by adding their tables.
+
+    Usage:
+        cms = CountMinSketch(epsilon=1e-6, delta=0.01)
+        cms.add(kmer_codes(genome, 21))
+        cms.query(codes)
+    """
+
+    def __init__(self, epsilon: float = 1e-5, delta: float = 0.01, seed: int = 0):
+        self.epsilon = epsilon
+        self.delta = delta
+        self.seed = seed
+        self.width = math.ceil(math.e / epsilon)
+        self.depth = math.ceil(math.log(1 / delta))
+        self.table = np.zeros((self.depth, self.width), dtype=np.int64)
+        self.total = 0
+
+    @property
+    def nbytes(self) -> int:
+        return self.table.nbytes
+
+    def _columns(self, keys: np.ndarray, row: int) -> np.ndarray:
+        return (splitmix64(keys, self.seed * 1000 + row) % np.uint64(self.width)).astype(np.int64)
+
+    def add(self, keys: np.ndarray, counts: np.ndarray = None) -> None:
+        """Adds each key once (or `counts[i]` times)."""
+        keys = np.asarray(keys, dtype=np.int64)
+        for row in range(self.depth):
+            self.table[row] += np.bincount(self._columns(keys, row), weights=counts,
+                                           minlength=self.width).astype(np.int64)
+        self.total += int(len(keys) if counts is None else np.sum(counts))
+
+    def query(self, keys: Union[int, np.ndarray]) -> Union[int, np.ndarray]:
+        """Returns the estimated count of each key (an upper bound of the true count)."""
+        scalar = np.ndim(keys) == 0
+        keys = np.atleast_1d(np.asarray(keys, dtype=np.int64))
+        estimate = self.table[0, self._columns(keys, 0)]
+        for row in range(1, self.depth):
+            estimate = np.minimum(estimate, self.table[row, self._columns(keys, row)])
+        return int(estimate[0]) if scalar else estimate
+
+    def _check_compatible(self, other: "CountMinSketch") -> None:
+        if (self.width, self.depth, self.seed) != (other.width, other.depth, other.seed):
+            raise ValueError("count-min sketches differ in width, depth or seed")
+
+    def merge(self, other: "CountMinSketch") -> None:
+        """Adds another sketch's counts into this one."""
+        self._check_compatible(other)
+        self.table += other.table
+        self.total += other.total
+
+
+class HyperLogLog:
+    """
+    Estimates the number of distinct 64-bit keys with 2**p one-byte registers.
+
+    The relative standard error is about 1.04 / sqrt(2**p) (p=14: 0.8% in
+    16 KiB). Small cardinalities use linear counting. Sketches with the same
+    p and seed are merged with an element-wise maximum.
+
+    Usage:
+        hll = HyperLogLog.for_error(0.01)
+        hll.add(kmer_codes(genome, 21))
+        hll.estimate()
+    """
+
+    def __init__(self, p: int = 14, seed: int = 0):
+        if not 4 <= p <= 24:
+            raise ValueError("p must be between 4 and 24")
+        self.p = p
+        self.seed = seed
+        self.registers = np.zeros(1 << p, dtype=np.uint8)
+
+    @classmethod
+    def for_error(cls, relative_error: float, seed: int = 0) -> "HyperLogLog":
+        """Returns the smallest sketch whose standard error is at most `relative_error`."""
+        p = math.ceil(math.log2((1.04 / relative_error) ** 2))
+        return cls(min(max(p, 4), 24), seed)
+
+    @property
+    def nbytes(self) -> int:
+        return self.registers.nbytes
+
+    def add(self, keys: np.ndarray) -> None:
+        hashes = splitmix64(np.asarray(keys, dtype=np.int64), self.seed)
+        index = (hashes >> np.uint64(64 - self.p)).astype(np.int64)
+        rest = (hashes << np.uint64(self.p)) & _MASK64
+        rank = np.minimum(_leading_zeros(rest) + 1, 64 - self.p + 1).astype(np.uint8)
+        np.maximum.at(self.registers, index, rank)
+
+    def estimate(self) -> float:
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        raw = alpha * m * m / np.sum(np.ldexp(1.0, -self.registers.astype(np.int64)))
+        empty = int(np.count_nonzero(self.registers == 0))
+        if raw <= 2.5 * m and empty:
+            return m * math.log(m / empty)
+        return float(raw)
+
+    def merge(self, other: "HyperLogLog") -> None:
+        if (self.p, self.seed) != (other.p, other.seed):
+            raise ValueError("HyperLogLog sketches differ in p or seed")
+        np.maximum(self.registers, other.registers, out=self.registers)
+
+
+class KmerSketch:
+    """
+    Approximate k-mer statistics in fixed memory, for k where exact tables
+    (alphabet**k entries, or one entry per distinct k-mer) are too large:
+    a CountMinSketch for per-k-mer frequencies and a HyperLogLog for the
+    number of distinct k-mers.
+
+    With canonical=True a k-mer and its reverse complement are counted as
+    one. Sketches built with the same parameters (k, alphabet, canonical,
+    epsilon, delta, p, seed) from different files can be merged, and
+    saved to and loaded from a .npz file.
+
+    Usage:
+        sketch = KmerSketch(21, epsilon=1e-6)
+        sketch.update_file("genome_a.fasta")
+        sketch.count("ACGTACGTACGTACGTACGTA"), sketch.distinct()
+    """
+
+    def __init__(self, k: int, alphabet: str = DNA, epsilon: float = 1e-5, delta: float = 0.01,
+                 p: int = 14, seed: int = 0, canonical: bool = False):
+        if len(alphabet) ** k >= 1 << 63:
+            raise ValueError(f"{len(alphabet)}**{k} k-mers do not fit in 64-bit codes")
+        self.k = k
+        self.alphabet = alphabet
+        self.canonical = canonical
+        self.counts = CountMinSketch(epsilon, delta, seed)
+        self.cardinality = HyperLogLog(p, seed)
+
+    def __repr__(self) -> str:
+        return (f"KmerSketch(k={self.k}, total={self.total}, distinct~{self.distinct():.0f}, "
+                f"bytes={self.nbytes})")
+
+    @property
+    def total(self) -> int:
+        """Number of k-mers added."""
+        return self.counts.total
+
+    @property
+    def nbytes(self) -> int:
+        return self.counts.nbytes + self.cardinality.nbytes
+
+    def add_codes(self, codes: np.ndarray) -> None:
+        self.counts.add(codes)
+        self.cardinality.add(codes)
+
+    def update(self, sequence: Union[Sequence, Iterable[Sequence]]) -> None:
+        """Adds the k-mers of one sequence or of several (k-mers never span two)."""
+        if isinstance(sequence, SEQUENCE_TYPES):
+            sequence = [sequence]
+        for seq in sequence:
+            self.add_codes(kmer_codes(seq, self.k, self.alphabet, self.canonical))
+
+    def update_file(self, source, block_size: int = 1 << 24) -> None:
+        """Streams a FASTA file into the sketch in blocks; memory stays fixed."""
+        for codes in iter_file_kmer_codes(source, self.k, self.alphabet, block_size, self.canonical):
+            self.add_codes(codes)
+
+    def count(self, kmer: str) -> int:
+        """Estimated occurrences of a k-mer (never less than the true count)."""
+        codes = kmer_codes(kmer, self.k, self.alphabet, self.canonical)
+        if len(kmer) != self.k or len(codes) != 1:
+            raise KeyError(kmer)
+        return self.counts.query(int(codes[0]))
+
+    def frequency(self, kmer: str) -> float:
+        return self.count(kmer) / self.total if self.total else 0.0
+
+    def distinct(self) -> float:
+        """Estimated number of distinct k-mers."""
+        return self.cardinality.estimate()
+
+    def merge(self, other: "KmerSketch") -> None:
+        if (self.k, self.alphabet, self.canonical) != (other.k, other.alphabet, other.canonical):
+            raise ValueError("k-mer sketches differ in k, alphabet or canonical mode")
+        self.counts.merge(other.counts)
+        self.cardinality.merge(other.cardinality)
+
+    def save(self, path: str) -> None:
+        np.savez(path, k=self.k, alphabet=self.alphabet, canonical=self.canonical, epsilon=self.counts.epsilon,
+                 delta=self.counts.delta, seed=self.counts.seed, total=self.counts.total,
+                 table=self.counts.table, registers=self.cardinality.registers)
+
+    @classmethod
+    def load(cls, path: str) -> "KmerSketch":
+        with np.load(path) as data:
+            sketch = cls(int(data['k']), str(data['alphabet']), float(data['epsilon']),
+                         float(data['delta']), int(np.log2(len(data['registers']))), int(data['seed']),
+                         bool(data['canonical']))
+            sketch.counts.table = data['table'].copy()
+            sketch.counts.total = int(data['total'])
+            sketch.cardinality.registers = data['registers'].copy()
+        return sketch
@@ -0,0 +1,46 @@
+from seqtools.cache import GenomeCache
+from seqtools.fasta import iter_fasta
+
+
+def test_cache_round_trip_keeps_rna(tmp_path):
+    path = tmp_path / "rna.fa"
+    path.write_text(">r1 rna\nACGUuacg\nNNugca\n>r2\nUUUU\n>r3\nACGT\n")
+    expected = [(header, sequence.upper()) for header, sequence in iter_fasta(str(path))]
+
+    cache = GenomeCache(cache_dir=str(tmp_path / "cache"))
+    parsed = [(header, str(seq)) for header, seq in cache.load(str(path))]
+    cached = [(header, str(seq)) for header, seq in cache.load(str(path))]
+
+    assert parsed == expected
+    assert cached == expected
+    assert cached[0][1] == "ACGUUACGNNUGCA"
+
+
+def test_rna_packs_like_dna(tmp_path):
+    from seqtools.packed import PackedSequence
+
+    rna = PackedSequence.from_str("ACGU" * 25000)
+    dna = PackedSequence.from_str("ACGT" * 25000)
+    assert rna.rna and not dna.rna
+    assert rna.nbytes == dna.nbytes == 25000
+    assert str(rna) == "ACGU" * 25000
+    assert str(rna[1:6].reverse_complement()) == "GUACG"
+
+    mixed = PackedSequence.from_str("ACGTU")
+    assert not mixed.rna and str(mixed) == "ACGTU"
+
+    path = tmp_path / "rna.fa"
+    path.write_text(">r\n" + "ACGU" * 2500 + "\n")
+    cache = GenomeCache(cache_dir=str(tmp_path / "cache"))
+    (_, seq), = cache.load(str(path))
+    assert seq.rna and seq.nbytes <= len(seq) // 4 + 1
+    assert str(seq) == "ACGU" * 2500
+
+
+def test_packed_index_accepts_numpy_integers():
+    import numpy as np
+    from seqtools.packed import PackedSequence
+
+    seq = PackedSequence.from_str("ACGTN")
+    assert [seq[np.int64(i)] for i in range(5)] == list("ACGTN")
+    assert seq[np.int32(-1)] == "N"
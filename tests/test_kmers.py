@@ -0,0 +1,53 @@
+import pytest
+
+from seqtools.kmers import count_kmers, count_kmers_file
+
+SEQUENCES = ["ACGTTGCAAGGCTTACGATCGATCGGATCCA", "TTGCAAGGCTA"]
+
+
+def write_fasta(path, records, width):
+    with open(path, "w") as f:
+        for i, sequence in enumerate(records):
+            f.write(f">r{i}\n")
+            for start in range(0, len(sequence), width):
+                f.write(sequence[start:start + width] + "\n")
+
+
+@pytest.mark.parametrize("block_size", [1, 2, 5, 8])
+@pytest.mark.parametrize("canonical", [False, True])
+def test_count_kmers_file_block_smaller_than_k(tmp_path, block_size, canonical):
+    # Short lines give blocks (and texts) shorter than k - 1.
+    path = tmp_path / "genome.fa"
+    write_fasta(path, SEQUENCES, width=3)
+
+    k = 9
+    expected = count_kmers(SEQUENCES, k, canonical=canonical)
+    assert expected.total > 0
+    assert count_kmers_file(str(path), k, block_size=block_size, canonical=canonical) == expected
+
+
+def test_count_kmers_accepts_packed_sequence():
+    from seqtools.packed import PackedSequence
+    from seqtools.sketch import KmerSketch
+
+    sequence = "ACGTTGCANNAGGCTTACGA"
+    packed = PackedSequence.from_str(sequence)
+    assert count_kmers(packed, 3) == count_kmers(sequence, 3)
+    assert count_kmers([packed, packed], 3) == count_kmers([sequence, sequence], 3)
+
+    sketch, expected = KmerSketch(k=3), KmerSketch(k=3)
+    sketch.update(packed)
+    expected.update(sequence)
+    assert sketch.distinct() == expected.distinct() > 0
+    assert sketch.count("ACG") == expected.count("ACG") == 2
+
+
+@pytest.mark.parametrize("k", [3, 12])  # dense and sparse (4**12 > DENSE_LIMIT) tables
+def test_count_kmers_sums_records(k):
+    from collections import Counter
+
+    records = SEQUENCES * 3 + ["", "ACG", "NNACGTNACGTACGTAC"]
+    expected = Counter(seq[i:i + k] for seq in records for i in range(len(seq) - k + 1)
+                       if set(seq[i:i + k]) <= set("ACGT"))
+    assert count_kmers(records, k).to_dict() == dict(sorted(expected.items()))
+    assert count_kmers([], k).total == 0
@@ -0,0 +1,79 @@
+import random
+
+import pytest
+
+from seqtools import melting
+from seqtools.primers import find_primers
+
+
+def make_sequence(n, seed=0):
+    # Random bases with some homopolymer runs and an ambiguous base mixed in.
+    rng = random.Random(seed)
+    parts = []
+    while sum(map(len, parts)) < n:
+        if rng.random() < 0.1:
+            parts.append(rng.choice("ACGT") * rng.randint(3, 7))
+        elif rng.random() < 0.02:
+            parts.append("N")
+        else:
+            parts.append("".join(rng.choice("ACGT") for _ in range(rng.randint(1, 12))))
+    return "".join(parts)[:n]
+
+
+def window_tm(window, method):
+    if method == 'wallace':
+        return float(melting.wallace_tm(window, len(window))[0])
+    if method == 'salt':
+        return float(melting.salt_adjusted_tm(window, len(window))[0])
+    return float(melting.nearest_neighbor_tm(window, len(window))[0])
+
+
+def brute_force(sequence, lengths, tm_range, gc_range, method, max_homopolymer, clamp_window, max_clamp_gc,
+                region_size, top_n):
+    target_tm = (tm_range[0] + tm_range[1]) / 2
+    region_size = region_size or len(sequence)
+    passing = {}
+    for length in lengths:
+        for start in range(len(sequence) - length + 1):
+            window = sequence[start:start + length]
+            if set(window) - set("ACGT"):
+                continue
+            gc_percent = 100.0 * (window.count("G") + window.count("C")) / length
+            tm = window_tm(window, method)
+            tail = window[-clamp_window:]
+            if not (tm_range[0] <= tm <= tm_range[1] and gc_range[0] <= gc_percent <= gc_range[1]):
+                continue
+            if any(base * (max_homopolymer + 1) in window for base in "ACGT"):
+                continue
+            if tail.count("G") + tail.count("C") > max_clamp_gc:
+                continue
+            penalty = abs(tm - target_tm) + 0.1 * abs(gc_percent - 50.0)
+            passing.setdefault(start // region_size * region_size, []).append((penalty, start, length))
+    # Best first; ties broken by start, then length.
+    ranked = {region: sorted(found, key=lambda c: (round(c[0], 9), c[1], c[2]))[:top_n]
+              for region, found in sorted(passing.items())}
+    return {region: [(start, length) for _, start, length in found] for region, found in ranked.items()}
+
+
+@pytest.mark.parametrize("method, tm_range", [('wallace', (50, 64)), ('salt', (40, 55)), ('nn', (35, 60))])
+@pytest.mark.parametrize("max_homopolymer, max_clamp_gc", [(2, 5), (3, 2), (4, 3)])
+@pytest.mark.parametrize("region_size, top_n", [(None, 7), (60, 3)])
+def test_find_primers_matches_brute_force(method, tm_range, max_homopolymer, max_clamp_gc, region_size, top_n):
+    sequence = make_sequence(240)
+    options = dict(lengths=range(12, 21), tm_range=tm_range, gc_range=(35.0, 65.0), method=method,
+                   max_homopolymer=max_homopolymer, clamp_window=5, max_clamp_gc=max_clamp_gc)
+
+    found = find_primers(sequence, region_size=region_size, top_n=top_n, **options)
+    expected = brute_force(sequence, region_size=region_size, top_n=top_n, **options)
+    assert expected, "the filters leave nothing to rank"
+    assert {region: [(c.start, c.length) for c in candidates] for region, candidates in found.items()} == expected
+
+    for candidates in found.values():
+        for c in candidates:
+            assert c.sequence == sequence[c.start:c.start + c.length]
+            assert c.tm == pytest.approx(window_tm(c.sequence, method))
+
+
+def test_find_primers_rejects_zero_homopolymer():
+    with pytest.raises(ValueError, match="max_homopolymer"):
+        find_primers("ACGT" * 10, max_homopolymer=0)